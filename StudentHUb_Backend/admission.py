@@ -0,0 +1,98 @@
+# backend/admission.py
+import os
+from collections import defaultdict
+from typing import Any, Dict, Tuple
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from .responses import stale_response
+
+# In-flight requests allowed per path, and across the whole worker
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "64"))
+ADMISSION_MAX_TOTAL = int(os.getenv("ADMISSION_MAX_TOTAL", "256"))
+# Seconds clients are asked to wait after a 503
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "5"))
+# Never shed: health checks, login, and the admin endpoints used to diagnose overload.
+# Alert subscriptions are long-lived and idle; the broadcast hub caps them itself.
+EXEMPT_PREFIXES: Tuple[str, ...] = ("/health", "/api/auth", "/api/admin", "/api/alerts/subscribe")
+
+
+class AdmissionController:
+    """Counts in-flight requests per path and decides when to shed load."""
+
+    def __init__(self, max_in_flight: int = ADMISSION_MAX_IN_FLIGHT, max_total: int = ADMISSION_MAX_TOTAL):
+        self.max_in_flight = max_in_flight
+        self.max_total = max_total
+        self.in_flight: Dict[str, int] = defaultdict(int)
+        self.total = 0
+        self.admitted = 0
+        self.shed = 0
+        self.served_stale = 0
+
+    def try_admit(self, path: str) -> bool:
+        if self.in_flight[path] >= self.max_in_flight or self.total >= self.max_total:
+            self.shed += 1
+            return False
+        self.in_flight[path] += 1
+        self.total += 1
+        self.admitted += 1
+        return True
+
+    def release(self, path: str) -> None:
+        self.in_flight[path] -= 1
+        self.total -= 1
+        if not self.in_flight[path]:
+            del self.in_flight[path]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_total": self.max_total,
+            "in_flight": self.total,
+            "by_path": dict(self.in_flight),
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "served_stale": self.served_stale,
+        }
+
+
+class AdmissionMiddleware:
+    """ASGI middleware that sheds load instead of queueing without bound.
+
+    Over the limit, a GET is answered with the last payload sent for the same
+    URL when there is one, otherwise with 503 and Retry-After. Requests stay
+    counted until their body (including a stream) has been fully sent.
+    """
+
+    def __init__(self, app, controller: "AdmissionController"):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if not self.controller.try_admit(path):
+            response = stale_response(Request(scope)) if scope["method"] == "GET" else None
+            if response is not None:
+                self.controller.served_stale += 1
+            else:
+                response = JSONResponse(
+                    {"detail": "Server is overloaded, please retry shortly."},
+                    status_code=503,
+                    headers={"Retry-After": str(ADMISSION_RETRY_AFTER)},
+                )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(path)
+
+
+# Shared controller; the middleware is installed in main.py
+admission_controller = AdmissionController()
@@ -0,0 +1,80 @@
+# backend/benchmarks/broadcast_bench.py
+"""Fan-out benchmark for broadcast.py.
+
+Opens N in-process subscribers (10k by default), each draining its own
+SSE stream the way a StreamingResponse would, then publishes a series of
+alert diffs. Reports memory per subscriber, the time publish() takes to
+queue one diff for everyone and the time until every subscriber has it.
+
+Run from the repository root:
+    python -m StudentHUb_Backend.benchmarks.broadcast_bench [subscribers] [diffs]
+"""
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+
+from ..broadcast import BroadcastHub
+
+TOPICS = ["exam_alerts", "college_alerts", "admission_alerts"]
+
+
+async def run(subscribers: int = 10_000, diffs: int = 20) -> None:
+    hub = BroadcastHub(max_subscribers=subscribers)
+    for topic in TOPICS:
+        hub.publish(topic, [{"title": f"{topic} {i}", "date": "2025"} for i in range(5)])
+
+    # Diff events seen per subscriber, and how many have seen the latest one
+    received = [0] * subscribers
+    caught_up = 0
+    target = 0
+    all_received = asyncio.Event()
+
+    async def consume(index: int, stream) -> None:
+        nonlocal caught_up
+        async for event in stream:
+            if not event.startswith("event: diff"):
+                continue
+            received[index] += 1
+            if received[index] == target:
+                caught_up += 1
+                if caught_up == subscribers:
+                    all_received.set()
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tasks = []
+    for i in range(subscribers):
+        subscription = hub.subscribe(TOPICS[:1 + i % len(TOPICS)] if i % 2 else ["exam_alerts"])
+        tasks.append(asyncio.create_task(consume(i, hub.stream(subscription))))
+    await asyncio.sleep(0.5)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    grown = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    print(f"{subscribers:,} subscribers: {grown / subscribers / 1024:.1f} KiB each (subscription, queue and stream task)")
+
+    publish_ms, delivered_ms = [], []
+    for n in range(diffs):
+        target = n + 1
+        caught_up = 0
+        all_received.clear()
+        started = time.perf_counter()
+        hub.publish("exam_alerts", [{"title": f"exam_alerts {i}", "date": f"2025-{n}"} for i in range(5)])
+        publish_ms.append((time.perf_counter() - started) * 1000)
+        await asyncio.wait_for(all_received.wait(), 30)
+        delivered_ms.append((time.perf_counter() - started) * 1000)
+
+    print(f"publish (queue for all)   p50 {statistics.median(publish_ms):7.1f} ms   max {max(publish_ms):7.1f} ms")
+    print(f"delivered to all          p50 {statistics.median(delivered_ms):7.1f} ms   max {max(delivered_ms):7.1f} ms")
+    print(hub.stats())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 10_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+    ))
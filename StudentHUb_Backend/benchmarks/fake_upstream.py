@@ -0,0 +1,95 @@
+# backend/benchmarks/fake_upstream.py
+"""Local stand-in for the Perplexity chat completions API with fault injection.
+
+Exercises deadlines, retries and the circuit breaker without real API calls.
+Start it, then point the backend at it:
+
+    uvicorn StudentHUb_Backend.benchmarks.fake_upstream:app --port 9100
+    PERPLEXITY_API_URL=http://127.0.0.1:9100/chat/completions PERPLEXITY_API_KEY=x \\
+        python -m StudentHUb_Backend.main
+
+Faults come from FAKE_LATENCY (seconds), FAKE_JITTER (seconds), FAKE_ERROR_RATE
+(0..1) and FAKE_ERROR_STATUS, and can be changed at runtime:
+
+    curl -X POST 'http://127.0.0.1:9100/_faults?error_rate=0.5&error_status=503'
+"""
+import asyncio
+import json
+import os
+import random
+from typing import Any, AsyncIterator, Dict
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+app = FastAPI(title="Fake Perplexity upstream")
+
+faults: Dict[str, Any] = {
+    "latency": float(os.getenv("FAKE_LATENCY", "0.2")),
+    "jitter": float(os.getenv("FAKE_JITTER", "0.1")),
+    "error_rate": float(os.getenv("FAKE_ERROR_RATE", "0")),
+    "error_status": int(os.getenv("FAKE_ERROR_STATUS", "503")),
+    "retry_after": None,
+}
+counters = {"requests": 0, "errors": 0}
+
+
+def fake_content(prompt: str) -> str:
+    items = [
+        {
+            "name": f"Item {i}",
+            "title": f"Item {i}",
+            "location": "Mumbai, Maharashtra",
+            "nirf_ranking": i,
+            "naac_grade": "A++",
+            "summary": f"Generated for: {prompt}",
+            "url": f"https://example.com/{i}",
+        }
+        for i in range(1, 11)
+    ]
+    return "Here is the data:\n```json\n" + json.dumps(items, indent=2) + "\n```"
+
+
+@app.post("/_faults")
+async def set_faults(
+    latency: float | None = None,
+    jitter: float | None = None,
+    error_rate: float | None = None,
+    error_status: int | None = None,
+    retry_after: float | None = None,
+):
+    for name, value in (
+        ("latency", latency),
+        ("jitter", jitter),
+        ("error_rate", error_rate),
+        ("error_status", error_status),
+        ("retry_after", retry_after),
+    ):
+        if value is not None:
+            faults[name] = value
+    return {"faults": faults, "counters": counters}
+
+
+@app.post("/chat/completions")
+async def chat_completions(request: Request):
+    counters["requests"] += 1
+    payload = await request.json()
+    await asyncio.sleep(max(0.0, faults["latency"] + random.uniform(-1, 1) * faults["jitter"]))
+
+    if random.random() < faults["error_rate"]:
+        counters["errors"] += 1
+        headers = {"Retry-After": str(faults["retry_after"])} if faults["retry_after"] is not None else None
+        return JSONResponse({"error": "injected fault"}, status_code=faults["error_status"], headers=headers)
+
+    content = fake_content(payload["messages"][-1]["content"])
+    if not payload.get("stream"):
+        return {"choices": [{"message": {"role": "assistant", "content": content}}]}
+
+    async def events() -> AsyncIterator[str]:
+        for start in range(0, len(content), 40):
+            chunk = {"choices": [{"delta": {"content": content[start:start + 40]}}]}
+            yield f"data: {json.dumps(chunk)}\n\n"
+            await asyncio.sleep(0.005)
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
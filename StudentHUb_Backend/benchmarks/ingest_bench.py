@@ -0,0 +1,72 @@
+# backend/benchmarks/ingest_bench.py
+"""Throughput benchmark for ingest.py.
+
+Writes a synthetic NIRF-style CSV (1M rows by default) to a temporary
+directory and streams it into a fresh SQLite database, reporting rows/s for
+parsing alone and for the full parse + normalize + upsert path.
+
+Run from the repository root:
+    python -m StudentHUb_Backend.benchmarks.ingest_bench [rows] [batch_size]
+"""
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ..database import Base
+from ..ingest import INGEST_BATCH_SIZE, ingest, iter_records, normalize_record, open_text
+from .. import models  # noqa: F401  (registers the tables on Base)
+
+STATES = ["Maharashtra", "Tamil Nadu", "Karnataka", "Delhi", "Uttar Pradesh", "West Bengal", "Telangana", "Rajasthan"]
+GRADES = ["A++", "A+", "A", "B++", "B+", "B"]
+
+
+def write_dataset(path: str, rows: int, seed: int = 7) -> None:
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Institute Name", "City", "State", "NIRF Rank", "NAAC Grade", "Median Salary", "Fees"])
+        for i in range(rows):
+            writer.writerow([
+                f"Institute of Technology {i}",
+                f"City {rng.randrange(500)}",
+                rng.choice(STATES),
+                i + 1 if rng.random() < 0.8 else "",
+                rng.choice(GRADES),
+                f"{rng.randrange(3, 40)} LPA",
+                f"Rs. {rng.randrange(1, 30)} lakhs",
+            ])
+
+
+def run(rows: int = 1_000_000, batch_size: int = INGEST_BATCH_SIZE) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "colleges.csv")
+        started = time.perf_counter()
+        write_dataset(csv_path, rows)
+        print(f"Generated {rows:,} rows ({os.path.getsize(csv_path) / 2 ** 20:.1f} MiB) in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        with open_text(csv_path) as source:
+            parsed = sum(1 for record in iter_records(source, "csv") if normalize_record(record))
+        elapsed = time.perf_counter() - started
+        print(f"{'parse + normalize':<24}{parsed:>12,} rows{parsed / elapsed:>14,.0f} rows/s")
+
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+        with open_text(csv_path) as source:
+            result = ingest(iter_records(source, "csv"), batch_size=batch_size, session_factory=session_factory)
+        print(f"{'full ingest (sqlite)':<24}{result['written']:>12,} rows{result['rows_per_second']:>14,} rows/s")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else INGEST_BATCH_SIZE,
+    )
@@ -0,0 +1,116 @@
+# backend/benchmarks/json_extract_bench.py
+"""Micro-benchmark for LLM JSON extraction.
+
+Compares llm_json.extract_json_from_response against the per-router
+extractors it replaced, over corpus/llm_responses.jsonl (response shapes
+seen from the sonar model: fenced blocks, prose with citation markers,
+nested arrays, trailing commas, truncated output).
+
+Run from the repository root:
+    python -m StudentHUb_Backend.benchmarks.json_extract_bench [iterations]
+"""
+import json
+import os
+import re
+import sys
+import time
+from typing import Callable, Dict, List
+
+from ..llm_json import extract_json_from_response
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "corpus", "llm_responses.jsonl")
+
+
+# Previous extractor from colleges.py / private_colleges.py
+def legacy_fenced(content: str) -> List[dict]:
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        json_match = re.search(r"```json\s*(\[[\s\S]*?\])\s*```", content, re.DOTALL)
+        if json_match:
+            try:
+                return json.loads(json_match.group(1))
+            except json.JSONDecodeError:
+                raise ValueError("Failed to extract valid JSON from AI response.")
+
+    raise ValueError("No valid JSON found in AI response.")
+
+
+# Previous extractor from edu_updates.py
+def legacy_trailing_comma(content: str) -> List[dict]:
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        json_match = re.search(r"```json\s*(\[[\s\S]*?\])\s*```", content, re.DOTALL)
+        if json_match:
+            cleaned_json = json_match.group(1).strip()
+            if cleaned_json.endswith(","):
+                cleaned_json = cleaned_json.rstrip(",") + "]"
+            return json.loads(cleaned_json)
+    raise ValueError("No valid JSON found in AI response.")
+
+
+# Previous extractor from latest_news.py / reviews.py
+def legacy_greedy(content: str) -> List[dict]:
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        json_match = re.search(r"\[\s*{.*?}\s*\]", content, re.DOTALL)
+        if json_match:
+            try:
+                return json.loads(json_match.group(0))
+            except json.JSONDecodeError:
+                raise ValueError("Failed to extract valid JSON from AI response.")
+    raise ValueError("No valid JSON found in AI response.")
+
+
+EXTRACTORS: Dict[str, Callable[[str], List[dict]]] = {
+    "llm_json": extract_json_from_response,
+    "legacy_fenced": legacy_fenced,
+    "legacy_trailing_comma": legacy_trailing_comma,
+    "legacy_greedy": legacy_greedy,
+}
+
+
+def load_corpus(path: str = CORPUS_PATH) -> List[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def is_correct(extractor: Callable[[str], List[dict]], entry: dict) -> bool:
+    try:
+        result = extractor(entry["content"])
+    except ValueError:
+        return entry["expected_items"] is None
+    return isinstance(result, list) and len(result) == entry["expected_items"]
+
+
+def run(iterations: int = 2000) -> None:
+    corpus = load_corpus()
+    total_bytes = sum(len(entry["content"].encode("utf-8")) for entry in corpus)
+    print(f"Corpus: {len(corpus)} responses, {total_bytes / 1024:.1f} KiB, {iterations} iterations\n")
+    print(f"{'extractor':<24}{'success':>10}{'responses/s':>16}{'MiB/s':>10}")
+
+    for name, extractor in EXTRACTORS.items():
+        correct = sum(is_correct(extractor, entry) for entry in corpus)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            for entry in corpus:
+                try:
+                    extractor(entry["content"])
+                except ValueError:
+                    pass
+        elapsed = time.perf_counter() - started
+        print(
+            f"{name:<24}{correct:>5}/{len(corpus):<4}"
+            f"{len(corpus) * iterations / elapsed:>16,.0f}"
+            f"{total_bytes * iterations / elapsed / 2 ** 20:>10.1f}"
+        )
+
+    failures = [entry["name"] for entry in corpus if not is_correct(extract_json_from_response, entry)]
+    if failures:
+        print(f"\nllm_json failed on: {', '.join(failures)}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
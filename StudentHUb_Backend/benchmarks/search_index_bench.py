@@ -0,0 +1,97 @@
+# backend/benchmarks/search_index_bench.py
+"""Query latency benchmark for search_index.py.
+
+Builds an index of synthetic colleges, news items and past answers (100k
+documents by default) and times answer() for queries that should hit
+locally, near misses and queries with no match.
+
+Run from the repository root:
+    python -m StudentHUb_Backend.benchmarks.search_index_bench [documents] [queries]
+"""
+import random
+import statistics
+import sys
+import time
+
+from ..search_index import SearchIndex
+
+STATES = ["Maharashtra", "Tamil Nadu", "Karnataka", "Delhi", "Uttar Pradesh", "West Bengal", "Telangana", "Rajasthan"]
+GRADES = ["A++", "A+", "A", "B++", "B+", "B"]
+WORDS = """admission exam result board cbse neet jee cutoff scholarship counselling university
+deadline registration notice syllabus hostel campus placement semester ugc aicte policy""".split()
+
+
+def _percentile(samples, pct: float) -> float:
+    return sorted(samples)[min(len(samples) - 1, int(len(samples) * pct))]
+
+
+def build(documents: int, seed: int = 11) -> SearchIndex:
+    rng = random.Random(seed)
+    index = SearchIndex(max_docs=documents)
+    colleges = documents * 6 // 10
+    news = documents * 3 // 10
+    index.add_colleges(
+        {
+            "name": f"Institute of Technology {i} Campus{i % 997}",
+            "location": f"City{rng.randrange(500)}, {rng.choice(STATES)}",
+            "nirf_ranking": i + 1,
+            "naac_grade": rng.choice(GRADES),
+            "highest_package": f"{rng.randrange(10, 60)} LPA",
+            "avg_package": f"{rng.randrange(3, 20)} LPA",
+            "fee_structure": f"Rs. {rng.randrange(1, 30)} lakhs",
+        }
+        for i in range(colleges)
+    )
+    index.add_news(
+        {
+            "title": f"{' '.join(rng.sample(WORDS, 4))} update {i}",
+            "date": "April 3, 2025",
+            "description": " ".join(rng.choice(WORDS) for _ in range(25)),
+            "read_more_url": f"https://example.com/news/{i}",
+        }
+        for i in range(news)
+    )
+    for i in range(documents - colleges - news):
+        query = f"{' '.join(rng.sample(WORDS, 3))} question {i}"
+        index.add_answer(query, {"response": " ".join(rng.choice(WORDS) for _ in range(120)), "related_queries": [], "images": []})
+    return index
+
+
+def time_queries(index: SearchIndex, queries) -> list:
+    samples = []
+    for query in queries:
+        started = time.perf_counter()
+        index.answer(query)
+        samples.append((time.perf_counter() - started) * 1e6)
+    return samples
+
+
+def run(documents: int = 100_000, queries: int = 5_000) -> None:
+    started = time.perf_counter()
+    index = build(documents)
+    build_seconds = time.perf_counter() - started
+    stats = index.stats()
+    print(f"Indexed {stats['documents']:,} documents ({stats['terms']:,} terms) in {build_seconds:.1f}s "
+          f"({stats['documents'] / build_seconds:,.0f} docs/s)")
+
+    rng = random.Random(3)
+    colleges = documents * 6 // 10
+    workloads = {
+        "college facts (hit)": [f"Institute of Technology {n} Campus{n % 997} nirf rank" for n in (rng.randrange(colleges) for _ in range(queries))],
+        "broad (miss)": [f"{rng.choice(WORDS)} {rng.choice(WORDS)}" for _ in range(queries)],
+        "unknown (miss)": [f"zzz{rng.randrange(10 ** 6)} college fees" for _ in range(queries)],
+    }
+    print(f"{'workload':<24}{'hit %':>8}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}")
+    for name, workload in workloads.items():
+        hits_before = index.hits
+        samples = time_queries(index, workload)
+        hit_pct = (index.hits - hits_before) / len(workload) * 100
+        print(f"{name:<24}{hit_pct:>8.1f}{statistics.median(samples):>10.1f}"
+              f"{_percentile(samples, 0.95):>10.1f}{_percentile(samples, 0.99):>10.1f}")
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5_000,
+    )
@@ -0,0 +1,70 @@
+# backend/benchmarks/suggest_bench.py
+"""Build time and lookup latency for suggest.py.
+
+Seeds synthetic college names and queries (1M entries by default) with
+skewed weights, rebuilds once and times suggest() for prefixes of 1 to 12
+characters drawn from the indexed phrases.
+
+Run from the repository root:
+    python -m StudentHUb_Backend.benchmarks.suggest_bench [entries] [lookups]
+"""
+import asyncio
+import random
+import statistics
+import sys
+import time
+
+from ..suggest import SuggestIndex
+
+CITIES = ["mumbai", "delhi", "chennai", "kolkata", "bangalore", "hyderabad", "pune", "jaipur", "lucknow", "bhopal"]
+TOPICS = ["placements", "fees", "cutoff", "admission", "courses", "hostel", "ranking", "scholarship"]
+
+
+def _percentile(samples, pct: float) -> float:
+    return sorted(samples)[min(len(samples) - 1, int(len(samples) * pct))]
+
+
+def seed(index: SuggestIndex, entries: int, seed: int = 5) -> list:
+    rng = random.Random(seed)
+    phrases = []
+    for i in range(entries):
+        if i % 2:
+            phrase = f"{rng.choice(['Institute of Technology', 'College of Engineering', 'University'])} {rng.choice(CITIES)} {i}"
+            index.seed(phrase)
+        else:
+            phrase = f"{rng.choice(CITIES)} college {i} {rng.choice(TOPICS)}"
+            # Zipf-like popularity
+            index.record(phrase, weight=1 + 1000 / (1 + rng.paretovariate(1.2)))
+        phrases.append(phrase)
+    return phrases
+
+
+def run(entries: int = 1_000_000, lookups: int = 20_000) -> None:
+    index = SuggestIndex(max_entries=entries)
+    started = time.perf_counter()
+    phrases = seed(index, entries)
+    print(f"Queued {entries:,} phrases in {time.perf_counter() - started:.1f}s")
+
+    asyncio.run(index.rebuild())
+    stats = index.stats()
+    print(f"Rebuilt in {stats['last_build_seconds']:.1f}s: {stats['suggestible']:,} suggestible, "
+          f"{stats['precomputed_prefixes']:,} precomputed prefixes")
+
+    rng = random.Random(9)
+    print(f"{'prefix length':<16}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}{'max us':>10}")
+    for length in (1, 2, 3, 5, 8, 12):
+        samples = []
+        for _ in range(lookups // 6):
+            prefix = rng.choice(phrases)[:length]
+            started = time.perf_counter()
+            index.suggest(prefix)
+            samples.append((time.perf_counter() - started) * 1e6)
+        print(f"{length:<16}{statistics.median(samples):>10.1f}{_percentile(samples, 0.95):>10.1f}"
+              f"{_percentile(samples, 0.99):>10.1f}{max(samples):>10.1f}")
+
+
+if __name__ == "__main__":
+    run(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20_000,
+    )
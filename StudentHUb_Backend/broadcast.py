@@ -0,0 +1,168 @@
+# backend/broadcast.py
+import asyncio
+import json
+import os
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from .streaming import sse_event
+
+# Events buffered per connection before it counts as a slow consumer and is dropped
+BROADCAST_QUEUE_SIZE = int(os.getenv("BROADCAST_QUEUE_SIZE", "16"))
+BROADCAST_MAX_SUBSCRIBERS = int(os.getenv("BROADCAST_MAX_SUBSCRIBERS", "20000"))
+# Comment line sent on idle connections so proxies keep them open (seconds)
+BROADCAST_HEARTBEAT = float(os.getenv("BROADCAST_HEARTBEAT", "15"))
+
+HEARTBEAT_EVENT = ": keepalive\n\n"
+
+
+class Subscription:
+    __slots__ = ("topics", "queue", "dropped")
+
+    def __init__(self, topics: List[str], queue_size: int):
+        self.topics = topics
+        # Holds pre-rendered SSE strings shared by every subscriber; None means "dropped"
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+
+def _identity(item: Any) -> str:
+    if isinstance(item, dict) and item.get("title"):
+        return " ".join(str(item["title"]).lower().split())
+    return json.dumps(item, sort_keys=True)
+
+
+class BroadcastHub:
+    """Fan-out of per-topic changes to server-sent event subscribers.
+
+    publish() diffs a topic's new items against the last ones it saw and
+    renders one "diff" event, which every subscriber's bounded queue then
+    shares. A subscriber whose queue is full is dropped with a "reset"
+    event instead of buffering without limit; EventSource reconnects on
+    its own and starts again from a fresh snapshot.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = BROADCAST_QUEUE_SIZE,
+        max_subscribers: int = BROADCAST_MAX_SUBSCRIBERS,
+        heartbeat: float = BROADCAST_HEARTBEAT,
+    ):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.heartbeat = heartbeat
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        # topic -> {identity: canonical JSON} and the items in feed order
+        self._versions: Dict[str, Dict[str, str]] = {}
+        self._items: Dict[str, List[Any]] = {}
+        self.connections = 0
+        self.published = 0
+        self.deliveries = 0
+        self.dropped = 0
+        self.rejected = 0
+
+    def has_state(self, topic: str) -> bool:
+        return topic in self._items
+
+    def subscribe(self, topics: Iterable[str]) -> Optional[Subscription]:
+        """Register a subscriber, or return None when the hub is full."""
+        if self.connections >= self.max_subscribers:
+            self.rejected += 1
+            return None
+        subscription = Subscription(list(topics), self.queue_size)
+        for topic in subscription.topics:
+            self._subscribers.setdefault(topic, set()).add(subscription)
+        self.connections += 1
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.get_running_loop().create_task(self._heartbeat_loop())
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        removed = False
+        for topic in subscription.topics:
+            subscribers = self._subscribers.get(topic)
+            if subscribers is not None and subscription in subscribers:
+                subscribers.discard(subscription)
+                removed = True
+        if removed:
+            self.connections -= 1
+
+    def publish(self, topic: str, items: List[Any]) -> Optional[Dict[str, Any]]:
+        """Record a topic's latest items and broadcast what changed (None if nothing did)."""
+        if not isinstance(items, list):
+            return None
+        previous = self._versions.get(topic, {})
+        current = {_identity(item): json.dumps(item, sort_keys=True) for item in items}
+        added, updated = [], []
+        for item in items:
+            identity = _identity(item)
+            if identity not in previous:
+                added.append(item)
+            elif previous[identity] != current[identity]:
+                updated.append(item)
+        removed = [identity for identity in previous if identity not in current]
+        self._versions[topic] = current
+        self._items[topic] = items
+        if not (added or updated or removed):
+            return None
+
+        diff = {"topic": topic, "added": added, "updated": updated, "removed": removed}
+        event = sse_event("diff", diff)
+        self.published += 1
+        for subscription in list(self._subscribers.get(topic, ())):
+            self._deliver(subscription, event)
+        return diff
+
+    async def _heartbeat_loop(self) -> None:
+        # One timer for every connection instead of a timeout on each queue read
+        while self.connections:
+            await asyncio.sleep(self.heartbeat)
+            subscriptions = set()
+            for subscribers in self._subscribers.values():
+                subscriptions.update(subscribers)
+            for subscription in subscriptions:
+                if subscription.queue.empty():
+                    subscription.queue.put_nowait(HEARTBEAT_EVENT)
+
+    def _deliver(self, subscription: Subscription, event: str) -> None:
+        try:
+            subscription.queue.put_nowait(event)
+            self.deliveries += 1
+        except asyncio.QueueFull:
+            # Too far behind: free its buffer and tell it to reconnect
+            self.unsubscribe(subscription)
+            subscription.dropped = True
+            self.dropped += 1
+            while not subscription.queue.empty():
+                subscription.queue.get_nowait()
+            subscription.queue.put_nowait(None)
+
+    async def stream(self, subscription: Subscription) -> AsyncIterator[str]:
+        """SSE for one subscriber: a snapshot per topic, then diffs as they are published."""
+        try:
+            for topic in subscription.topics:
+                yield sse_event("snapshot", {"topic": topic, "items": self._items.get(topic, [])})
+            while True:
+                event = await subscription.queue.get()
+                if event is None:
+                    yield sse_event("reset", {"detail": "Subscriber fell behind; reconnect to resume."})
+                    return
+                yield event
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connections": self.connections,
+            "max_subscribers": self.max_subscribers,
+            "by_topic": {topic: len(subscribers) for topic, subscribers in self._subscribers.items()},
+            "queue_size": self.queue_size,
+            "published": self.published,
+            "deliveries": self.deliveries,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+        }
+
+
+# Shared hub for /api/alerts/subscribe, fed by every alerts refresh
+alert_hub = BroadcastHub()
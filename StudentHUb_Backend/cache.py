@@ -0,0 +1,194 @@
+# backend/cache.py
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .limiter import Priority, upstream_priority
+from .singleflight import SingleFlight
+
+# Default limits (overridable via environment)
+MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+DEFAULT_STALE_TTL = float(os.getenv("RESPONSE_CACHE_STALE_TTL", str(24 * 60 * 60)))
+
+
+def make_key(router: str, category: str, prompt: str) -> str:
+    """Build a cache key from router name, category and a hash of the prompt."""
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+    return f"{router}:{category}:{digest}"
+
+
+def _estimate_size(value: Any) -> int:
+    try:
+        return len(json.dumps(value, separators=(",", ":"), default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    size: int
+    expires_at: float
+    stale_until: float
+
+
+class ResponseCache:
+    """In-process TTL cache with LRU eviction and stale-while-revalidate."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, max_bytes: int = MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self.flights = SingleFlight("response_cache")
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.stale_if_error = 0
+        self.evictions = 0
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        now = time.monotonic()
+        if now < entry.expires_at or (allow_stale and now < entry.stale_until):
+            self._entries.move_to_end(key)
+            return entry.value
+        return None
+
+    def set(self, key: str, value: Any, ttl: float, stale_ttl: float = DEFAULT_STALE_TTL) -> None:
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+        self._discard(key)
+        now = time.monotonic()
+        self._entries[key] = CacheEntry(value, size, now + ttl, now + ttl + stale_ttl)
+        self._bytes += size
+        self._evict()
+
+    def invalidate(self, key: str) -> None:
+        self._discard(key)
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+    ) -> Any:
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None:
+            if now < entry.expires_at:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            if now < entry.stale_until:
+                # Serve stale right away and refresh once in the background
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                self._schedule_refresh(key, fetch, ttl, stale_ttl)
+                return entry.value
+
+        # Concurrent misses for the same key share one upstream fetch
+        self.misses += 1
+        try:
+            return await self.flights.do(key, lambda: self._fetch_and_store(key, fetch, ttl, stale_ttl))
+        except Exception as e:
+            # Past its stale window, the last good value still beats an error
+            if entry is None:
+                raise
+            self.stale_if_error += 1
+            print(f"❌ Fetch failed for {key}, serving last good value: {e}")
+            return entry.value
+
+    def refresh_in_background(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+    ) -> bool:
+        """Start a background fetch unless key holds a fresh value, without waiting for it.
+
+        For callers that serve their own copy of the data (e.g. the catalog)
+        and only use the cache to decide when to refill it. Returns True while
+        a fetch for key is running.
+        """
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None and now < entry.expires_at:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return False
+        if entry is not None and now < entry.stale_until:
+            self.stale_hits += 1
+        else:
+            self.misses += 1
+        self._schedule_refresh(key, fetch, ttl, stale_ttl)
+        return key in self._refreshing
+
+    async def _fetch_and_store(self, key: str, fetch: Callable[[], Awaitable[Any]], ttl: float, stale_ttl: float) -> Any:
+        value = await fetch()
+        self.set(key, value, ttl, stale_ttl)
+        return value
+
+    def _schedule_refresh(self, key: str, fetch: Callable[[], Awaitable[Any]], ttl: float, stale_ttl: float) -> None:
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            upstream_priority.set(Priority.BACKGROUND)
+            try:
+                await self.flights.do(key, lambda: self._fetch_and_store(key, fetch, ttl, stale_ttl))
+                self.refreshes += 1
+            except Exception as e:
+                self.refresh_errors += 1
+                print(f"❌ Background refresh failed for {key}: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "stale_if_error": self.stale_if_error,
+            "refreshing": len(self._refreshing),
+            "evictions": self.evictions,
+        }
+
+
+# Shared cache for the fixed-prompt LLM endpoints
+response_cache = ResponseCache()
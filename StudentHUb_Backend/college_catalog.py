@@ -0,0 +1,226 @@
+# backend/college_catalog.py
+import base64
+import json
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import AsyncSessionLocal, upsert_statement
+from .models import College
+from .result_store import _utcnow
+from .search_index import search_index
+
+# Sort name -> (column, descending)
+SORTS = {
+    "rank": (College.nirf_ranking, False),
+    "-rank": (College.nirf_ranking, True),
+    "name": (College.name, False),
+    "-name": (College.name, True),
+}
+MAX_PAGE_SIZE = 100
+
+# Row sources; official datasets win over LLM lists
+SOURCE_LLM = "llm"
+SOURCE_INGEST = "ingest"
+# Fields a source may leave blank; a blank never erases a stored value
+MERGED_COLUMNS = [
+    "name", "location", "state", "nirf_ranking", "naac_grade",
+    "highest_package", "avg_package", "fee_structure", "logo_url",
+]
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_INT_RE = re.compile(r"\d+")
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def normalize_name(name: str) -> str:
+    """'I.I.T. Bombay ' and 'IIT  Bombay' both become 'iit bombay'."""
+    text = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii").lower()
+    text = text.replace(".", "")
+    return _NON_ALNUM_RE.sub(" ", text).strip()
+
+
+def _parse_rank(value: Any) -> Optional[int]:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    match = _INT_RE.search(str(value or ""))
+    return int(match.group()) if match else None
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+def to_row(item: Dict[str, Any], is_private: bool, source: str = SOURCE_LLM) -> Optional[Dict[str, Any]]:
+    """Map one parsed college object to a colleges row (None if it has no name)."""
+    name = _text(item.get("name"))
+    if not name or not normalize_name(name):
+        return None
+    location = _text(item.get("location"))
+    state = location.rsplit(",", 1)[-1].strip() if location and "," in location else None
+    grade = _text(item.get("naac_grade"))
+    return {
+        "normalized_name": normalize_name(name),
+        "name": name,
+        "location": location,
+        "state": state.title() if state else None,
+        "nirf_ranking": _parse_rank(item.get("nirf_ranking")),
+        "naac_grade": grade.upper()[:8] if grade else None,
+        "highest_package": _text(item.get("highest_package")),
+        "avg_package": _text(item.get("avg_package")),
+        "fee_structure": _text(item.get("fee_structure")),
+        "logo_url": _text(item.get("logo_url")),
+        "is_private": is_private,
+        "source": source,
+        "updated_at": _utcnow(),
+    }
+
+
+def catalog_upsert_statement(
+    rows: Optional[List[Dict[str, Any]]],
+    is_private: bool,
+    dialect_name: Optional[str] = None,
+    source: str = SOURCE_LLM,
+):
+    """INSERT ... ON CONFLICT (normalized_name) DO UPDATE for rows from to_row()
+    (rows=None for an executemany statement).
+
+    Missing values never overwrite stored ones. An ingest overwrites any
+    field it provides and marks the row as ingested; an LLM list only fills
+    the gaps of an ingested row, so official ranks and fees survive every
+    refresh. Only the private list marks a college private; other sources
+    never clear that flag.
+    """
+    update_columns = MERGED_COLUMNS + ["updated_at"]
+    existing_wins = None
+    if source == SOURCE_INGEST:
+        update_columns.append("source")
+    else:
+        existing_wins = College.__table__.c.source == SOURCE_INGEST
+    if is_private:
+        update_columns.append("is_private")
+    return upsert_statement(
+        College.__table__, rows, index_elements=["normalized_name"], update_columns=update_columns,
+        dialect_name=dialect_name, keep_existing=MERGED_COLUMNS, existing_wins=existing_wins,
+    )
+
+
+def dedupe_rows(items: Iterable[Dict[str, Any]], is_private: bool, source: str = SOURCE_LLM) -> List[Dict[str, Any]]:
+    """Convert items to rows, keeping the last one per normalized name."""
+    rows: Dict[str, Dict[str, Any]] = {}
+    for item in items:
+        row = to_row(item, is_private, source) if isinstance(item, dict) else None
+        if row is not None:
+            rows[row["normalized_name"]] = row
+    return list(rows.values())
+
+
+async def upsert_colleges(items: List[Dict[str, Any]], is_private: bool = False, session_factory=AsyncSessionLocal) -> int:
+    """Merge parsed LLM colleges into the catalog, one row per normalized name.
+
+    A database error is logged and otherwise ignored.
+    """
+    rows = dedupe_rows(items, is_private)
+    if not rows:
+        return 0
+    try:
+        async with session_factory() as db:
+            await db.execute(catalog_upsert_statement(rows, is_private, db.bind.dialect.name))
+            await db.commit()
+    except SQLAlchemyError as e:
+        print(f"❌ College catalog update failed: {e}")
+        return 0
+    search_index.add_colleges(rows)
+    return len(rows)
+
+
+def encode_cursor(sort: str, value: Any, row_id: int) -> str:
+    raw = json.dumps([sort, value, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, row_id = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursor("Malformed cursor.")
+    if cursor_sort != sort or not isinstance(row_id, int):
+        raise InvalidCursor("Cursor does not match this sort order.")
+    return value, row_id
+
+
+def college_to_dict(college: College) -> Dict[str, Any]:
+    return {
+        "id": college.id,
+        "name": college.name,
+        "location": college.location,
+        "state": college.state,
+        "nirf_ranking": college.nirf_ranking,
+        "naac_grade": college.naac_grade,
+        "highest_package": college.highest_package,
+        "avg_package": college.avg_package,
+        "fee_structure": college.fee_structure,
+        "logo_url": college.logo_url,
+    }
+
+
+async def list_colleges(
+    db: AsyncSession,
+    is_private: Optional[bool] = None,
+    state: Optional[str] = None,
+    grade: Optional[str] = None,
+    min_rank: Optional[int] = None,
+    max_rank: Optional[int] = None,
+    sort: str = "rank",
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Return one page of colleges and the cursor for the next page (or None).
+
+    Keyset pagination: the page after a cursor starts strictly after its
+    (sort value, id), so deep pages cost the same as the first. Colleges
+    without a rank sort after ranked ones in either direction.
+    """
+    column, descending = SORTS[sort]
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    query = select(College)
+    if is_private is not None:
+        query = query.where(College.is_private == is_private)
+    if state:
+        query = query.where(College.state == state.strip().title())
+    if grade:
+        query = query.where(College.naac_grade == grade.strip().upper())
+    if min_rank is not None:
+        query = query.where(College.nirf_ranking >= min_rank)
+    if max_rank is not None:
+        query = query.where(College.nirf_ranking <= max_rank)
+
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort)
+        if value is None:
+            query = query.where(column.is_(None), College.id > last_id)
+        else:
+            beyond = column < value if descending else column > value
+            query = query.where(or_(beyond, and_(column == value, College.id > last_id), column.is_(None)))
+
+    query = query.order_by(column.is_(None), column.desc() if descending else column.asc(), College.id).limit(limit + 1)
+    colleges = (await db.execute(query)).scalars().all()
+
+    next_cursor = None
+    if len(colleges) > limit:
+        colleges = colleges[:limit]
+        last = colleges[-1]
+        next_cursor = encode_cursor(sort, getattr(last, column.key), last.id)
+    return [college_to_dict(college) for college in colleges], next_cursor
@@ -1,6 +1,7 @@
-
 # backend/database.py
-from sqlalchemy import create_engine
+from sqlalchemy import case, create_engine, func
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -8,12 +9,53 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+# Falls back to a local SQLite file when DATABASE_URL is not set
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./studenthub.db")
+
+# Connection pool settings (ignored for SQLite, which uses its own pooling)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1").lower() not in ("0", "false", "no")
+
+
+def to_async_url(url: str) -> str:
+    """Swap a sync driver for its asyncio counterpart (asyncpg / aiosqlite)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "postgresql":
+        return parsed.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+    if backend == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    return url
+
+
+def pool_options(url: str) -> dict:
+    options = {"pool_pre_ping": DB_POOL_PRE_PING}
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    return options
 
-engine = create_engine(DATABASE_URL)
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+engine = create_engine(DATABASE_URL, **pool_options(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async engine for request handlers, so DB I/O does not block the event loop
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **pool_options(ASYNC_DATABASE_URL))
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Rows per multi-row INSERT; keeps SQLite under its bound-parameter limit
+UPSERT_BATCH_SIZE = int(os.getenv("UPSERT_BATCH_SIZE", "500"))
+
 def get_db():
     from fastapi import Depends
     db = SessionLocal()
@@ -21,3 +63,51 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def upsert_statement(table, rows, index_elements, update_columns, dialect_name=None, keep_existing=(), existing_wins=None):
+    """Build a multi-row INSERT ... ON CONFLICT DO UPDATE for Postgres or SQLite.
+
+    With rows=None the statement has no VALUES; execute it with a list of row
+    dicts to run it as an executemany that compiles once and is cached. No
+    update_columns means ON CONFLICT DO NOTHING. Columns in keep_existing are
+    set to COALESCE(excluded.col, table.col), so a NULL never overwrites a
+    stored value; on rows matching the existing_wins condition they are set
+    to COALESCE(table.col, excluded.col), so new values only fill gaps.
+    """
+    dialect_name = dialect_name or engine.dialect.name
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Upsert is not supported for dialect '{dialect_name}'.")
+
+    stmt = insert(table) if rows is None else insert(table).values(rows)
+    if not update_columns:
+        return stmt.on_conflict_do_nothing(index_elements=index_elements)
+
+    def merged(column):
+        new, old = stmt.excluded[column], table.c[column]
+        if column not in keep_existing:
+            return new
+        if existing_wins is None:
+            return func.coalesce(new, old)
+        return case((existing_wins, func.coalesce(old, new)), else_=func.coalesce(new, old))
+
+    return stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={column: merged(column) for column in update_columns},
+    )
+
+
+def bulk_upsert(db, table, rows, index_elements, update_columns, batch_size=UPSERT_BATCH_SIZE):
+    """Upsert rows in batches, each one executemany of a cached statement; the caller commits."""
+    stmt = upsert_statement(table, None, index_elements, update_columns, db.bind.dialect.name)
+    for start in range(0, len(rows), batch_size):
+        db.execute(stmt, rows[start:start + batch_size])
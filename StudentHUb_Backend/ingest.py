@@ -0,0 +1,178 @@
+# backend/ingest.py
+"""Stream official college datasets (NIRF / AISHE style CSV or JSON lines) into the catalog.
+
+Files are read row by row (optionally gzip-compressed), normalized to the
+college dict shape the LLM endpoints produce, and upserted in batches.
+
+Run from the repository root:
+    python -m StudentHUb_Backend.ingest nirf_2024.csv [--format csv|jsonl] [--batch-size 1000] [--private]
+"""
+import argparse
+import csv
+import gzip
+import io
+import json
+import re
+import sys
+import time
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from .college_catalog import SOURCE_INGEST, catalog_upsert_statement, dedupe_rows
+from .database import Base, SessionLocal, engine
+
+# Use orjson for JSON lines when it is installed
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+INGEST_BATCH_SIZE = 1000
+PROGRESS_EVERY = 100_000
+
+# Normalized source header -> college field
+FIELD_ALIASES = {
+    "name": "name",
+    "college": "name",
+    "college name": "name",
+    "institute": "name",
+    "institute name": "name",
+    "institution": "name",
+    "institution name": "name",
+    "location": "location",
+    "city": "city",
+    "state": "state",
+    "rank": "nirf_ranking",
+    "nirf rank": "nirf_ranking",
+    "nirf ranking": "nirf_ranking",
+    "naac": "naac_grade",
+    "naac grade": "naac_grade",
+    "grade": "naac_grade",
+    "highest package": "highest_package",
+    "max salary": "highest_package",
+    "average package": "avg_package",
+    "avg package": "avg_package",
+    "median salary": "avg_package",
+    "fees": "fee_structure",
+    "fee": "fee_structure",
+    "fee structure": "fee_structure",
+    "logo": "logo_url",
+    "logo url": "logo_url",
+}
+
+_HEADER_RE = re.compile(r"[\s_\-]+")
+
+
+def normalize_header(header: str) -> str:
+    return _HEADER_RE.sub(" ", header.strip().lower())
+
+
+# Files repeat the same few headers on every row, so map each one once
+@lru_cache(maxsize=1024)
+def _field_for(header: str) -> Optional[str]:
+    return FIELD_ALIASES.get(normalize_header(header))
+
+
+def normalize_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a source record onto the college dict shape used by colleges.py."""
+    college: Dict[str, Any] = {}
+    for key, value in record.items():
+        field = _field_for(str(key))
+        if field is not None and value not in (None, ""):
+            college[field] = value
+    city = college.pop("city", None)
+    state = college.pop("state", None)
+    if "location" not in college and (city or state):
+        college["location"] = ", ".join(part for part in (city, state) if part)
+    return college
+
+
+def open_text(path: str) -> TextIO:
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+def iter_records(source: TextIO, fmt: str) -> Iterator[Dict[str, Any]]:
+    if fmt == "csv":
+        yield from csv.DictReader(source)
+        return
+    for line in source:
+        if line.strip():
+            record = _loads(line)
+            if isinstance(record, dict):
+                yield record
+
+
+def _batches(records: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ingest(
+    records: Iterable[Dict[str, Any]],
+    is_private: bool = False,
+    batch_size: int = INGEST_BATCH_SIZE,
+    session_factory=SessionLocal,
+    progress_every: Optional[int] = PROGRESS_EVERY,
+) -> Dict[str, Any]:
+    """Upsert source records into the colleges table in batches.
+
+    Each batch is one executemany and one commit, so memory stays flat for
+    any file size. Returns row counts and throughput.
+    """
+    started = time.perf_counter()
+    read = written = 0
+    next_report = progress_every
+    with session_factory() as db:
+        # Built once without VALUES: each batch is an executemany of the cached statement
+        stmt = catalog_upsert_statement(None, is_private, db.bind.dialect.name, source=SOURCE_INGEST)
+        for batch in _batches(records, batch_size):
+            read += len(batch)
+            rows = dedupe_rows((normalize_record(record) for record in batch), is_private, SOURCE_INGEST)
+            if rows:
+                db.execute(stmt, rows)
+                db.commit()
+                written += len(rows)
+            if next_report and read >= next_report:
+                elapsed = time.perf_counter() - started
+                print(f"🔹 {read:,} rows read, {written:,} upserted ({read / elapsed:,.0f} rows/s)", file=sys.stderr)
+                next_report += progress_every
+    elapsed = time.perf_counter() - started
+    return {
+        "read": read,
+        "written": written,
+        "skipped": read - written,
+        "seconds": round(elapsed, 2),
+        "rows_per_second": round(read / elapsed) if elapsed else 0,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Stream a college dataset into the catalog.")
+    parser.add_argument("path", help="CSV or JSON-lines file, optionally .gz ('-' for stdin)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=INGEST_BATCH_SIZE)
+    parser.add_argument("--private", action="store_true", help="mark every college as private")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("jsonl" if args.path.removesuffix(".gz").endswith((".jsonl", ".ndjson")) else "csv")
+    Base.metadata.create_all(bind=engine)
+    with open_text(args.path) as source:
+        result = ingest(iter_records(source, fmt), is_private=args.private, batch_size=args.batch_size)
+    print(f"🔹 Ingested {result['written']:,} of {result['read']:,} rows in {result['seconds']}s "
+          f"({result['rows_per_second']:,} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
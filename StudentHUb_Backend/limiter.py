@@ -0,0 +1,176 @@
+# backend/limiter.py
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+# Outbound request rate (per second) and burst allowed by the upstream quota
+LIMITER_RATE = float(os.getenv("UPSTREAM_RATE_LIMIT", "5"))
+LIMITER_BURST = float(os.getenv("UPSTREAM_RATE_BURST", "10"))
+LIMITER_MAX_IN_FLIGHT = int(os.getenv("UPSTREAM_MAX_IN_FLIGHT", "8"))
+# How long a call may queue for a slot before giving up (seconds)
+LIMITER_MAX_WAIT = float(os.getenv("UPSTREAM_MAX_QUEUE_WAIT", "15"))
+LIMITER_MAX_QUEUE = int(os.getenv("UPSTREAM_MAX_QUEUE", "500"))
+
+
+class Priority(IntEnum):
+    """Lower values are served first."""
+
+    INTERACTIVE = 0
+    DASHBOARD = 1
+    BACKGROUND = 2
+
+
+# Priority for upstream calls made from the current task; prefetch jobs and
+# background cache refreshes set BACKGROUND, interactive search passes its own
+upstream_priority: ContextVar[Priority] = ContextVar("upstream_priority", default=Priority.DASHBOARD)
+
+
+class QueueTimeoutError(httpx.HTTPError):
+    """Raised when an upstream call could not get a slot in time."""
+
+
+class OutboundLimiter:
+    """Token bucket plus max-in-flight cap for upstream calls.
+
+    Callers that cannot start right away wait in a priority queue (FIFO within
+    a priority) instead of hitting the upstream quota and failing with 429s.
+    """
+
+    def __init__(
+        self,
+        rate: float = LIMITER_RATE,
+        burst: float = LIMITER_BURST,
+        max_in_flight: int = LIMITER_MAX_IN_FLIGHT,
+        max_wait: float = LIMITER_MAX_WAIT,
+        max_queue: int = LIMITER_MAX_QUEUE,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self._tokens = burst
+        self._refilled_at = time.monotonic()
+        self._in_flight = 0
+        self._queue: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._granted = {priority: 0 for priority in Priority}
+        self._wait_total = {priority: 0.0 for priority in Priority}
+        self._wait_max = {priority: 0.0 for priority in Priority}
+        self.timeouts = 0
+        self.rejected = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _try_take(self) -> bool:
+        if self._in_flight >= self.max_in_flight:
+            return False
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self._in_flight += 1
+        return True
+
+    def _dispatch(self) -> None:
+        self._timer = None
+        while self._queue:
+            future = self._queue[0][2]
+            if future.done():
+                # Timed out or cancelled while queued
+                heapq.heappop(self._queue)
+                continue
+            if not self._try_take():
+                break
+            heapq.heappop(self._queue)
+            future.set_result(None)
+        if self._queue and self._in_flight < self.max_in_flight and self._timer is None:
+            # Out of tokens: wake up when the next one is due
+            delay = max(0.0, (1 - self._tokens) / self.rate)
+            self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    async def acquire(self, priority: Priority) -> None:
+        started = time.monotonic()
+        if not self._queue and self._try_take():
+            self._record(priority, 0.0)
+            return
+        if len(self._queue) >= self.max_queue:
+            self.rejected += 1
+            raise QueueTimeoutError("Upstream queue is full.")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (int(priority), next(self._seq), future))
+        self._dispatch()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # Granted just as we gave up; hand the slot back
+                self.release()
+            else:
+                future.cancel()
+            if isinstance(e, asyncio.TimeoutError):
+                self.timeouts += 1
+                raise QueueTimeoutError(f"No upstream slot within {self.max_wait:g}s.")
+            raise
+        self._record(priority, time.monotonic() - started)
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: Optional[Priority] = None) -> AsyncIterator[None]:
+        await self.acquire(priority if priority is not None else upstream_priority.get())
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _record(self, priority: Priority, waited: float) -> None:
+        self._granted[priority] += 1
+        self._wait_total[priority] += waited
+        self._wait_max[priority] = max(self._wait_max[priority], waited)
+
+    def stats(self) -> Dict[str, Any]:
+        self._refill()
+        queued = {priority.name.lower(): 0 for priority in Priority}
+        for value, _, future in self._queue:
+            if not future.done():
+                queued[Priority(value).name.lower()] += 1
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "tokens": round(self._tokens, 2),
+            "in_flight": self._in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queue_depth": sum(queued.values()),
+            "queued": queued,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "priorities": {
+                priority.name.lower(): {
+                    "granted": self._granted[priority],
+                    "avg_wait_ms": round(self._wait_total[priority] / self._granted[priority] * 1000, 2)
+                    if self._granted[priority] else 0.0,
+                    "max_wait_ms": round(self._wait_max[priority] * 1000, 2),
+                }
+                for priority in Priority
+            },
+        }
+
+
+# Shared limiter for all Perplexity calls
+outbound_limiter = OutboundLimiter()
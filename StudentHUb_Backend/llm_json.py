@@ -0,0 +1,172 @@
+# backend/llm_json.py
+import json
+import re
+from typing import List, Optional, Tuple
+
+# Use orjson for decoding when it is installed
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+_TRAILING_COMMA_RE = re.compile(r",\s*([\]}])")
+# Skips plain text and whole JSON strings, capturing the next bracket; a
+# string left open by truncated output runs to the end of input. Written in
+# "unrolled loop" form so it never backtracks catastrophically.
+_BRACKET_RE = re.compile(r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*(?:"|\Z)[^"\[\]{}]*)*(?:([\[\]{}])|\Z)')
+
+
+def find_json_array(content: str, start: int = 0, allow_empty: bool = False) -> Optional[Tuple[int, int, bool]]:
+    """Locate the first JSON array of objects in content with one linear scan.
+
+    An empty "[]" only counts with allow_empty. Returns (start, end, closed). For a closed array content[start:end] is the
+    whole array; for output truncated mid-array it ends after the last
+    complete top-level object. Returns None when no array is found.
+    """
+    length = len(content)
+    pos = content.find("[", start)
+    while pos != -1:
+        lookahead = pos + 1
+        while lookahead < length and content[lookahead].isspace():
+            lookahead += 1
+        if lookahead < length and (content[lookahead] == "{" or (allow_empty and content[lookahead] == "]")):
+            break
+        pos = content.find("[", pos + 1)
+    if pos == -1:
+        return None
+
+    # Jump from bracket to bracket; brackets inside strings are never seen
+    depth = 0
+    last_object_end = -1
+    for match in _BRACKET_RE.finditer(content, pos):
+        char = match.group(1)
+        if char is None:
+            break
+        if char == "[" or char == "{":
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return pos, match.end(), True
+            if depth == 1 and char == "}":
+                last_object_end = match.end()
+    if last_object_end == -1:
+        return None
+    return pos, last_object_end, False
+
+
+def extract_json_from_response(content: str) -> List[dict]:
+    """Extract the outermost JSON array from an LLM response.
+
+    Handles bare JSON, ```json fences, surrounding prose and citation markers,
+    nested arrays and strings containing brackets, trailing commas and output
+    truncated mid-array. The array text is decoded once. An empty "[]" is
+    only returned when no array of objects parses, so a stray "[]" in the
+    prose never hides the real list.
+    """
+    for allow_empty in (False, True):
+        start = 0
+        while True:
+            found = find_json_array(content, start, allow_empty)
+            if found is None:
+                break
+            begin, end, closed = found
+            candidate = content[begin:end] if closed else content[begin:end] + "]"
+            try:
+                return _loads(candidate)
+            except ValueError:
+                try:
+                    return _loads(_TRAILING_COMMA_RE.sub(r"\1", candidate))
+                except ValueError:
+                    # Not valid JSON after all; keep scanning past this bracket
+                    start = begin + 1
+    raise ValueError("No valid JSON found in AI response.")
+
+
+class IncrementalArrayParser:
+    """Yield each object of a streamed JSON array as soon as it closes.
+
+    Text before the array (prose, a ```json fence, citation markers like
+    "[1]") is skipped: the array starts at the first "[" whose next
+    non-whitespace character is "{".
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._object_start = -1
+        self.skipped = 0
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def feed(self, text: str) -> List[dict]:
+        if self._done:
+            return []
+        self._buffer += text
+        items: List[dict] = []
+        buffer = self._buffer
+        pos = self._pos
+        length = len(buffer)
+
+        while pos < length:
+            char = buffer[pos]
+
+            if not self._started:
+                if char == "[":
+                    # Need the next non-whitespace character to decide
+                    lookahead = pos + 1
+                    while lookahead < length and buffer[lookahead].isspace():
+                        lookahead += 1
+                    if lookahead == length:
+                        break
+                    if buffer[lookahead] == "{":
+                        self._started = True
+                        self._depth = 1
+                pos += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._depth == 1 and char == "{":
+                    self._object_start = pos
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1 and char == "}" and self._object_start >= 0:
+                    try:
+                        items.append(json.loads(buffer[self._object_start:pos + 1]))
+                    except json.JSONDecodeError:
+                        self.skipped += 1
+                    self._object_start = -1
+                elif self._depth == 0:
+                    self._done = True
+                    pos += 1
+                    break
+            pos += 1
+
+        # Drop consumed text that can no longer be part of a pending object
+        keep_from = self._object_start if self._object_start >= 0 else pos
+        if not self._started:
+            keep_from = pos
+        self._buffer = buffer[keep_from:]
+        self._pos = pos - keep_from
+        if self._object_start >= 0:
+            self._object_start -= keep_from
+        return items
@@ -1,5 +1,6 @@
 # backend/main.py
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,15 +9,36 @@ from fastapi.middleware.cors import CORSMiddleware
 load_dotenv()
 
 # Import DB setup
-from database import Base, engine
+from .admission import AdmissionMiddleware, admission_controller
+from .database import Base, async_engine, engine
+from .perplexity import close_client
+from .scheduler import maintenance_scheduler, prefetch_scheduler
 
 # Ensure all routers are imported correctly
-from routers import colleges, search, edu_updates, reviews, private_colleges , latest_news, auth
+from .routers import colleges, search, edu_updates, reviews, private_colleges , latest_news, auth, admin
 
-app = FastAPI(title="Student Hub API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keep news, alerts and insights snapshots warm in the background
+    await prefetch_scheduler.start()
+    # OTP sweep and local index rebuilds, on their own tasks and semaphore
+    await maintenance_scheduler.start()
+    yield
+    await maintenance_scheduler.stop()
+    await prefetch_scheduler.stop()
+    # Release pooled upstream and database connections on shutdown
+    await close_client()
+    await async_engine.dispose()
+
+
+app = FastAPI(title="Student Hub API", lifespan=lifespan)
 # Initialize DB tables
 Base.metadata.create_all(bind=engine)
 
+# Shed load once too many requests are in flight (added first so CORS wraps its 503s)
+app.add_middleware(AdmissionMiddleware, controller=admission_controller)
+
 # Enable CORS for frontend access
 app.add_middleware(
     CORSMiddleware,
@@ -27,14 +49,23 @@ app.add_middleware(
 )
 
 # Include routers
-app.include_router(colleges.router) 
-app.include_router(private_colleges.router)  
-app.include_router(search.router)     
-app.include_router(edu_updates.router)  
+app.include_router(colleges.router)
+app.include_router(private_colleges.router)
+app.include_router(search.router)
+app.include_router(edu_updates.router)
 app.include_router(reviews.router)
 app.include_router(latest_news.router)
-app.include_router(auth.router) 
+app.include_router(auth.router)
+app.include_router(admin.router)
+
+
+# Liveness probe; exempt from admission control
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
 
 if __name__ == "__main__":
+    # Run from the repository root: python -m StudentHUb_Backend.main
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run("StudentHUb_Backend.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,7 +1,7 @@
 
 # backend/models.py
 
-from sqlalchemy import Column, Integer, String, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, JSON, Index
 from .database import Base
 
 class User(Base):
@@ -11,3 +11,69 @@ class User(Base):
     phone = Column(String, unique=True, index=True, nullable=False)
     location = Column(String, nullable=True)
     is_verified = Column(Boolean, default=False)
+
+class LLMResult(Base):
+    __tablename__ = "llm_results"
+
+    key = Column(String, primary_key=True)
+    prompt_hash = Column(String(64), nullable=False)
+    payload = Column(JSON, nullable=False)
+    fetched_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    __table_args__ = (
+        Index("ix_llm_results_key_expires_at", "key", "expires_at"),
+    )
+
+class OTPCode(Base):
+    __tablename__ = "otp_codes"
+
+    phone = Column(String, primary_key=True)
+    code = Column(String(10), nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+class College(Base):
+    __tablename__ = "colleges"
+
+    id = Column(Integer, primary_key=True)
+    # Lowercased, punctuation-free name; one row per college across LLM lists
+    normalized_name = Column(String, unique=True, nullable=False)
+    name = Column(String, nullable=False, index=True)
+    location = Column(String, nullable=True)
+    state = Column(String, nullable=True, index=True)
+    nirf_ranking = Column(Integer, nullable=True, index=True)
+    naac_grade = Column(String(8), nullable=True, index=True)
+    highest_package = Column(String, nullable=True)
+    avg_package = Column(String, nullable=True)
+    fee_structure = Column(String, nullable=True)
+    logo_url = Column(String, nullable=True)
+    is_private = Column(Boolean, nullable=False, default=False)
+    # "ingest" for official datasets, "llm" for rows only the LLM lists have provided
+    source = Column(String(16), nullable=False, default="llm", server_default="llm")
+    updated_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        # Keyset pagination in rank order, optionally restricted to private colleges
+        Index("ix_colleges_private_rank_id", "is_private", "nirf_ranking", "id"),
+    )
+
+class NewsItem(Base):
+    __tablename__ = "news_items"
+
+    # Append-only; ids only grow, so they double as the feed cursor
+    id = Column(Integer, primary_key=True)
+    source = Column(String(32), nullable=False)
+    # read_more_url without scheme, "www.", fragment or tracking parameters
+    url_key = Column(String, unique=True, nullable=True)
+    # 64-bit SimHash of title + description, stored signed
+    simhash = Column(BigInteger, nullable=False)
+    title = Column(String, nullable=False)
+    date = Column(String, nullable=True)
+    description = Column(String, nullable=True)
+    image_url = Column(String, nullable=True)
+    read_more_url = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_news_items_source_id", "source", "id"),
+    )
@@ -0,0 +1,176 @@
+# backend/news_store.py
+import hashlib
+import os
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .college_catalog import decode_cursor, encode_cursor
+from .database import AsyncSessionLocal, upsert_statement
+from .models import NewsItem
+from .result_store import _utcnow
+from .search_cache import tokenize
+
+# Items whose SimHashes differ in at most this many of 64 bits are the same story.
+# Rewordings of one article measured 2-10 bits apart, distinct stories on the
+# same topic (class 10 vs class 12 results) 11 and up.
+NEWS_SIMHASH_DISTANCE = int(os.getenv("NEWS_SIMHASH_DISTANCE", "7"))
+# Repeats come back within a few refreshes, so only the latest items are compared
+NEWS_DEDUP_WINDOW = int(os.getenv("NEWS_DEDUP_WINDOW", "1000"))
+NEWS_PAGE_SIZE = 20
+NEWS_MAX_PAGE_SIZE = 100
+
+_TRACKING_PARAMS = frozenset({"fbclid", "gclid", "ref", "amp"})
+_CURSOR_SORT = "news"
+
+
+def normalize_url(url: Any) -> Optional[str]:
+    """'https://www.Example.com/a/?utm_source=x#top' becomes 'example.com/a'."""
+    if not isinstance(url, str) or not url.strip():
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    if not host:
+        return None
+    query = sorted((k, v) for k, v in parse_qsl(parts.query) if not (k.lower().startswith("utm_") or k.lower() in _TRACKING_PARAMS))
+    key = host + (parts.path.rstrip("/") or "")
+    return f"{key}?{urlencode(query)}" if query else key
+
+
+@lru_cache(maxsize=65536)
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash over stemmed, stopword-free tokens weighted by count."""
+    weights = [0] * 64
+    for feature, count in Counter(tokenize(text)).items():
+        value = _feature_hash(feature)
+        for bit in range(64):
+            weights[bit] += count if value >> bit & 1 else -count
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def _to_signed(value: int) -> int:
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def _text(value: Any) -> Optional[str]:
+    text = str(value).strip() if value is not None else ""
+    return text or None
+
+
+async def append_news(items: Iterable[Dict[str, Any]], source: str, session_factory=AsyncSessionLocal) -> int:
+    """Append items not seen before and return how many were added.
+
+    An item is a repeat when its normalized read_more_url is already stored
+    or its title + description SimHash is within NEWS_SIMHASH_DISTANCE bits
+    of a recent item from the same source. A database error is logged and
+    otherwise ignored.
+    """
+    candidates = []
+    for item in items:
+        title = _text(item.get("title")) if isinstance(item, dict) else None
+        if title:
+            description = _text(item.get("description") or item.get("details"))
+            candidates.append((item, title, description, normalize_url(item.get("read_more_url"))))
+    if not candidates:
+        return 0
+
+    try:
+        async with session_factory() as db:
+            recent = await db.execute(
+                select(NewsItem.url_key, NewsItem.simhash)
+                .where(NewsItem.source == source)
+                .order_by(NewsItem.id.desc())
+                .limit(NEWS_DEDUP_WINDOW)
+            )
+            seen_urls = set()
+            seen_hashes = []
+            for url_key, value in recent:
+                seen_urls.add(url_key)
+                seen_hashes.append(_to_unsigned(value))
+            url_keys = [url_key for *_, url_key in candidates if url_key]
+            if url_keys:
+                stored = await db.execute(select(NewsItem.url_key).where(NewsItem.url_key.in_(url_keys)))
+                seen_urls.update(stored.scalars())
+
+            rows = []
+            now = _utcnow()
+            # Feeds list the newest article first; store it last so it gets the highest id
+            for item, title, description, url_key in reversed(candidates):
+                if url_key and url_key in seen_urls:
+                    continue
+                value = simhash(f"{title} {description or ''}")
+                if any((value ^ other).bit_count() <= NEWS_SIMHASH_DISTANCE for other in seen_hashes):
+                    continue
+                seen_urls.add(url_key)
+                seen_hashes.append(value)
+                rows.append({
+                    "source": source,
+                    "url_key": url_key,
+                    "simhash": _to_signed(value),
+                    "title": title,
+                    "date": _text(item.get("date")),
+                    "description": description,
+                    "image_url": _text(item.get("image_url")),
+                    "read_more_url": _text(item.get("read_more_url")),
+                    "created_at": now,
+                })
+            if rows:
+                # Another worker may have stored the same URL in the meantime
+                await db.execute(upsert_statement(NewsItem.__table__, rows, ["url_key"], [], db.bind.dialect.name))
+                await db.commit()
+    except SQLAlchemyError as e:
+        print(f"❌ News store update failed: {e}")
+        return 0
+    return len(rows)
+
+
+def news_to_dict(item: NewsItem) -> Dict[str, Any]:
+    return {
+        "id": item.id,
+        "title": item.title,
+        "date": item.date,
+        "description": item.description,
+        "image_url": item.image_url,
+        "read_more_url": item.read_more_url,
+    }
+
+
+async def list_news(
+    db: AsyncSession,
+    source: str,
+    since: Optional[str] = None,
+    limit: int = NEWS_PAGE_SIZE,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Return a page of news and the cursor to poll with next.
+
+    Without since: the newest items, newest first. With since: items added
+    after that cursor, oldest first, so a client can page forward until the
+    list comes back empty. Either way the returned cursor marks the newest
+    item the client has now seen.
+    """
+    limit = max(1, min(limit, NEWS_MAX_PAGE_SIZE))
+    query = select(NewsItem).where(NewsItem.source == source)
+    if since:
+        _, last_id = decode_cursor(since, _CURSOR_SORT)
+        query = query.where(NewsItem.id > last_id).order_by(NewsItem.id)
+    else:
+        query = query.order_by(NewsItem.id.desc())
+    items = (await db.execute(query.limit(limit))).scalars().all()
+
+    if not items:
+        return [], since
+    newest = items[-1] if since else items[0]
+    return [news_to_dict(item) for item in items], encode_cursor(_CURSOR_SORT, None, newest.id)
@@ -0,0 +1,116 @@
+# backend/otp_store.py
+import hmac
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Tuple
+
+from sqlalchemy import delete
+
+from .database import AsyncSessionLocal, upsert_statement
+from .models import OTPCode
+from .result_store import _utcnow
+
+# "memory" keeps codes in this process; "sql" shares them across workers
+OTP_STORE = os.getenv("OTP_STORE", "memory").lower()
+OTP_TTL = float(os.getenv("OTP_TTL", "300"))
+OTP_MAX_ENTRIES = int(os.getenv("OTP_MAX_ENTRIES", "100000"))
+OTP_SWEEP_INTERVAL = float(os.getenv("OTP_SWEEP_INTERVAL", "60"))
+
+
+class OTPStore(ABC):
+    """Interface for one-time codes keyed by phone number."""
+
+    @abstractmethod
+    async def put(self, phone: str, code: str, ttl: float = OTP_TTL) -> None:
+        ...
+
+    @abstractmethod
+    async def verify(self, phone: str, code: str) -> bool:
+        """Consume the code if it matches and has not expired."""
+
+    @abstractmethod
+    async def sweep(self) -> int:
+        """Delete every expired code; returns how many were removed."""
+
+
+class MemoryOTPStore(OTPStore):
+    """Process-local store with TTL and a size cap (oldest codes are dropped first).
+
+    Expired codes are removed when read and by periodic sweep() calls.
+    """
+
+    def __init__(self, max_entries: int = OTP_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._codes: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    async def put(self, phone: str, code: str, ttl: float = OTP_TTL) -> None:
+        self._codes.pop(phone, None)
+        self._codes[phone] = (code, time.monotonic() + ttl)
+        while len(self._codes) > self.max_entries:
+            self._codes.popitem(last=False)
+
+    async def verify(self, phone: str, code: str) -> bool:
+        entry = self._codes.get(phone)
+        if entry is None:
+            return False
+        if entry[1] <= time.monotonic():
+            del self._codes[phone]
+            return False
+        if not hmac.compare_digest(entry[0], code):
+            return False
+        del self._codes[phone]
+        return True
+
+    async def sweep(self) -> int:
+        now = time.monotonic()
+        expired = [phone for phone, (_, expires_at) in self._codes.items() if expires_at <= now]
+        for phone in expired:
+            del self._codes[phone]
+        return len(expired)
+
+
+class SQLOTPStore(OTPStore):
+    """Codes in the otp_codes table, shared by every worker using the database."""
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+
+    async def put(self, phone: str, code: str, ttl: float = OTP_TTL) -> None:
+        row = {"phone": phone, "code": code, "expires_at": _utcnow() + timedelta(seconds=ttl)}
+        async with self.session_factory() as db:
+            await db.execute(upsert_statement(OTPCode.__table__, [row], ["phone"], ["code", "expires_at"]))
+            await db.commit()
+
+    async def verify(self, phone: str, code: str) -> bool:
+        # Match and consume in one statement so two workers cannot both accept a code
+        async with self.session_factory() as db:
+            result = await db.execute(
+                delete(OTPCode).where(
+                    OTPCode.phone == phone,
+                    OTPCode.code == code,
+                    OTPCode.expires_at > _utcnow(),
+                )
+            )
+            await db.commit()
+            return result.rowcount == 1
+
+    async def sweep(self) -> int:
+        async with self.session_factory() as db:
+            result = await db.execute(delete(OTPCode).where(OTPCode.expires_at <= _utcnow()))
+            await db.commit()
+            return result.rowcount
+
+
+def create_otp_store(kind: str = OTP_STORE) -> OTPStore:
+    if kind == "memory":
+        return MemoryOTPStore()
+    if kind == "sql":
+        return SQLOTPStore()
+    raise ValueError(f"Unknown OTP_STORE '{kind}'; expected 'memory' or 'sql'.")
+
+
+# Shared store used by routers/auth.py
+otp_store = create_otp_store()
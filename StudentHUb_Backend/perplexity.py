@@ -0,0 +1,181 @@
+# backend/perplexity.py
+import json
+import logging
+import os
+import httpx
+from typing import AsyncIterator
+from dotenv import load_dotenv
+
+from .limiter import Priority, outbound_limiter
+from .resilience import resilient_send, upstream_breaker, upstream_retry_budget
+
+# Per-call tracing, off unless debug logging is configured; prompts are never
+# logged since /api/search passes raw user text
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY")
+if not PERPLEXITY_API_KEY:
+    raise ValueError("API Key not found! Ensure PERPLEXITY_API_KEY is set in your .env file.")
+
+PERPLEXITY_API_URL = os.getenv("PERPLEXITY_API_URL", "https://api.perplexity.ai/chat/completions")
+PERPLEXITY_MODEL = os.getenv("PERPLEXITY_MODEL", "sonar")
+
+# Connection pool / timeout settings (seconds)
+CONNECT_TIMEOUT = float(os.getenv("PERPLEXITY_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("PERPLEXITY_READ_TIMEOUT", "60"))
+WRITE_TIMEOUT = float(os.getenv("PERPLEXITY_WRITE_TIMEOUT", "10"))
+POOL_TIMEOUT = float(os.getenv("PERPLEXITY_POOL_TIMEOUT", "10"))
+MAX_CONNECTIONS = int(os.getenv("PERPLEXITY_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("PERPLEXITY_MAX_KEEPALIVE_CONNECTIONS", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("PERPLEXITY_KEEPALIVE_EXPIRY", "30"))
+HTTP2 = os.getenv("PERPLEXITY_HTTP2", "1").lower() not in ("0", "false", "no")
+# Overall budget for one call, retries included, unless the endpoint sets its own
+DEFAULT_DEADLINE = float(os.getenv("PERPLEXITY_DEADLINE", "90"))
+
+_client: httpx.AsyncClient | None = None
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared pooled client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=HTTP2 and _http2_available(),
+            timeout=httpx.Timeout(
+                connect=CONNECT_TIMEOUT,
+                read=READ_TIMEOUT,
+                write=WRITE_TIMEOUT,
+                pool=POOL_TIMEOUT,
+            ),
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            headers={
+                "Authorization": f"Bearer {PERPLEXITY_API_KEY}",
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            },
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def build_payload(instructions: str, prompt: str, max_tokens: int) -> dict:
+    return {
+        "model": PERPLEXITY_MODEL,
+        "messages": [
+            {"role": "system", "content": instructions},
+            {"role": "user", "content": prompt}
+        ],
+        "max_tokens": max_tokens
+    }
+
+
+# Helper: Send one chat completion and return the combined content
+async def chat_completion(
+    instructions: str,
+    prompt: str,
+    max_tokens: int = 3000,
+    deadline: float | None = None,
+    priority: Priority | None = None,
+) -> str:
+    """Raises httpx.HTTPError on transport/status errors, an exceeded deadline,
+    an open circuit or a full outbound queue, and ValueError on malformed
+    output. 429/5xx are retried; each attempt waits for an outbound slot."""
+    logger.debug("Sending query to Perplexity AI (%d prompt chars)", len(prompt))
+    client = get_client()
+    payload = build_payload(instructions, prompt, max_tokens)
+
+    async def send() -> httpx.Response:
+        async with outbound_limiter.slot(priority):
+            return await client.post(PERPLEXITY_API_URL, json=payload)
+
+    response = await resilient_send(
+        send,
+        deadline=deadline or DEFAULT_DEADLINE,
+        breaker=upstream_breaker,
+        budget=upstream_retry_budget,
+    )
+    response.raise_for_status()
+    data = response.json()
+
+    if "choices" not in data or not data["choices"]:
+        raise ValueError("Invalid AI response structure: 'choices' missing.")
+
+    # Extract combined content from 'message' and 'delta'
+    content = "".join(
+        (choice.get("message") or {}).get("content", "") +
+        (choice.get("delta") or {}).get("content", "")
+        for choice in data["choices"]
+    )
+
+    if not content:
+        raise ValueError("Empty content in AI response.")
+
+    return content
+
+
+# Helper: Stream a chat completion, yielding content deltas as they arrive
+async def stream_chat_completion(
+    instructions: str,
+    prompt: str,
+    max_tokens: int = 3000,
+    deadline: float | None = None,
+    priority: Priority | None = None,
+) -> AsyncIterator[str]:
+    """Raises httpx.HTTPError on transport/status errors.
+
+    Retries and the deadline cover opening the stream only; once the first
+    byte has arrived the response is passed through as-is. One outbound slot
+    is held for the life of the stream.
+    """
+    logger.debug("Streaming query to Perplexity AI (%d prompt chars)", len(prompt))
+    client = get_client()
+    payload = build_payload(instructions, prompt, max_tokens)
+    payload["stream"] = True
+    async with outbound_limiter.slot(priority):
+        response = await resilient_send(
+            lambda: client.send(
+                client.build_request("POST", PERPLEXITY_API_URL, json=payload, headers={"Accept": "text/event-stream"}),
+                stream=True,
+            ),
+            deadline=deadline or DEFAULT_DEADLINE,
+            breaker=upstream_breaker,
+            budget=upstream_retry_budget,
+        )
+        try:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    chunk = json.loads(data)
+                except json.JSONDecodeError:
+                    continue
+                for choice in chunk.get("choices", []):
+                    text = (choice.get("delta") or {}).get("content")
+                    if text:
+                        yield text
+        finally:
+            await response.aclose()
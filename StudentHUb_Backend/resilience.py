@@ -0,0 +1,235 @@
+# backend/resilience.py
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+import httpx
+
+# Retry policy
+MAX_ATTEMPTS = int(os.getenv("UPSTREAM_MAX_ATTEMPTS", "3"))
+BACKOFF_BASE = float(os.getenv("UPSTREAM_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = float(os.getenv("UPSTREAM_BACKOFF_MAX", "8"))
+# Retries may add at most this fraction on top of first attempts
+RETRY_BUDGET_RATIO = float(os.getenv("UPSTREAM_RETRY_BUDGET_RATIO", "0.2"))
+RETRY_BUDGET_MIN = float(os.getenv("UPSTREAM_RETRY_BUDGET_MIN", "10"))
+
+# Circuit breaker
+BREAKER_FAILURE_RATE = float(os.getenv("BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_MIN_REQUESTS = int(os.getenv("BREAKER_MIN_REQUESTS", "10"))
+BREAKER_WINDOW = float(os.getenv("BREAKER_WINDOW", "30"))
+BREAKER_OPEN_SECONDS = float(os.getenv("BREAKER_OPEN_SECONDS", "15"))
+# A half-open probe that has not reported back by then is presumed lost (seconds)
+BREAKER_PROBE_TIMEOUT = float(os.getenv("BREAKER_PROBE_TIMEOUT", "120"))
+
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """Raised without calling upstream while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Error-rate circuit breaker over a sliding time window.
+
+    closed -> open once the failure rate reaches the threshold (with at least
+    min_requests samples); open -> half_open after open_seconds, letting one
+    probe through; the probe's outcome closes or re-opens the circuit. A
+    probe that ends without an outcome (cancelled, or failing before it
+    reached upstream) re-opens it; one that never reports back is replaced
+    after probe_timeout.
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = BREAKER_FAILURE_RATE,
+        min_requests: int = BREAKER_MIN_REQUESTS,
+        window: float = BREAKER_WINDOW,
+        open_seconds: float = BREAKER_OPEN_SECONDS,
+        probe_timeout: float = BREAKER_PROBE_TIMEOUT,
+    ):
+        self.failure_rate = failure_rate
+        self.min_requests = min_requests
+        self.window = window
+        self.open_seconds = open_seconds
+        self.probe_timeout = probe_timeout
+        self.state = "closed"
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_started = 0.0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def _trim(self, now: float) -> None:
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            _, ok = self._outcomes.popleft()
+            if not ok:
+                self._failures -= 1
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        now = time.monotonic()
+        if self.state == "open" and now - self._opened_at >= self.open_seconds:
+            self.state = "half_open"
+            self._probe_in_flight = False
+        if self.state == "half_open" and self._probe_in_flight and now - self._probe_started >= self.probe_timeout:
+            self._probe_in_flight = False
+        if self.state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            self._probe_started = now
+            return True
+        self.rejected += 1
+        return False
+
+    def abandon(self) -> None:
+        """End a call that produced no upstream outcome; a pending probe counts as failed."""
+        if self.state == "half_open" and self._probe_in_flight:
+            self.record(False)
+
+    def record(self, ok: bool) -> None:
+        now = time.monotonic()
+        if self.state == "half_open":
+            self._probe_in_flight = False
+            if ok:
+                self.state = "closed"
+                self._outcomes.clear()
+                self._failures = 0
+            else:
+                self._open(now)
+            return
+
+        self._outcomes.append((now, ok))
+        if not ok:
+            self._failures += 1
+        self._trim(now)
+        total = len(self._outcomes)
+        if self.state == "closed" and total >= self.min_requests and self._failures / total >= self.failure_rate:
+            self._open(now)
+
+    def _open(self, now: float) -> None:
+        self.state = "open"
+        self._opened_at = now
+        self.times_opened += 1
+
+    def stats(self) -> Dict[str, Any]:
+        self._trim(time.monotonic())
+        total = len(self._outcomes)
+        return {
+            "state": self.state,
+            "window_requests": total,
+            "window_failure_rate": round(self._failures / total, 4) if total else 0.0,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+class RetryBudget:
+    """Token bucket that caps retries to a fraction of overall traffic."""
+
+    def __init__(self, ratio: float = RETRY_BUDGET_RATIO, minimum: float = RETRY_BUDGET_MIN):
+        self.ratio = ratio
+        self.capacity = minimum
+        self.tokens = minimum
+        self.retries = 0
+        self.exhausted = 0
+
+    def record_request(self) -> None:
+        self.tokens = min(self.capacity, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.retries += 1
+            return True
+        self.exhausted += 1
+        return False
+
+    def stats(self) -> Dict[str, Any]:
+        return {"tokens": round(self.tokens, 2), "retries": self.retries, "exhausted": self.exhausted}
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_MAX) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+async def resilient_send(
+    send: Callable[[], Awaitable[httpx.Response]],
+    deadline: float,
+    breaker: CircuitBreaker,
+    budget: RetryBudget,
+    max_attempts: int = MAX_ATTEMPTS,
+) -> httpx.Response:
+    """Send with bounded, jittered retries on 429/5xx and transport errors.
+
+    The whole exchange, including backoff sleeps, must finish within
+    deadline seconds. Responses that are not retryable (including other 4xx)
+    are returned for the caller to check. A retryable response from a
+    streamed send is closed before retrying.
+    """
+    budget.record_request()
+
+    async def attempts() -> httpx.Response:
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError("Upstream circuit is open; failing fast.")
+            retry_after = None
+            try:
+                response = await send()
+            except httpx.TransportError as e:
+                breaker.record(False)
+                error: httpx.HTTPError = e
+            except BaseException:
+                # Cancelled (client gone, deadline) or failed locally (e.g. limiter queue timeout)
+                breaker.abandon()
+                raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS:
+                    breaker.record(True)
+                    return response
+                breaker.record(False)
+                retry_after = retry_after_seconds(response)
+                await response.aclose()
+                error = httpx.HTTPStatusError(
+                    f"Upstream returned {response.status_code}", request=response.request, response=response
+                )
+
+            attempt += 1
+            if attempt >= max_attempts or not budget.try_spend():
+                raise error
+            delay = backoff_delay(attempt)
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+            await asyncio.sleep(delay)
+
+    try:
+        return await asyncio.wait_for(attempts(), timeout=deadline)
+    except asyncio.TimeoutError:
+        breaker.record(False)
+        raise httpx.TimeoutException(f"Upstream deadline of {deadline:g}s exceeded")
+
+
+# Shared state for the Perplexity upstream
+upstream_breaker = CircuitBreaker()
+upstream_retry_budget = RetryBudget()
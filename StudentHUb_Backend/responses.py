@@ -0,0 +1,187 @@
+# backend/responses.py
+import gzip
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+
+# Optional faster serializer / brotli support
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = int(os.getenv("MIN_COMPRESS_SIZE", "512"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+PAYLOAD_MEMO_SIZE = int(os.getenv("PAYLOAD_MEMO_SIZE", "256"))
+# Last payload sent per URL, kept for serving under overload
+LAST_PAYLOAD_SIZE = int(os.getenv("LAST_PAYLOAD_SIZE", "512"))
+
+
+def dumps_compact(data: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class Payload:
+    """A JSON body serialized once, with compressed variants built on first use."""
+
+    __slots__ = ("data", "body", "etag", "_encoded")
+
+    def __init__(self, data: Any):
+        self.data = data
+        self.body = dumps_compact(data)
+        # Weak, since the same ETag covers every content-coding of the body
+        self.etag = 'W/"' + hashlib.blake2b(self.body, digest_size=16).hexdigest() + '"'
+        self._encoded: Dict[str, bytes] = {}
+
+    def encoded(self, encoding: Optional[str]) -> bytes:
+        if encoding is None:
+            return self.body
+        body = self._encoded.get(encoding)
+        if body is None:
+            if encoding == "br":
+                body = brotli.compress(self.body, quality=BROTLI_QUALITY)
+            else:
+                body = gzip.compress(self.body, compresslevel=GZIP_LEVEL, mtime=0)
+            self._encoded[encoding] = body
+        return body
+
+
+# Payloads memoized by the identity of the cached object(s) they were built
+# from, so repeated hits on a cache entry or snapshot reuse the same bytes
+_memo: "OrderedDict[Tuple[int, ...], Tuple[Tuple[Any, ...], Payload]]" = OrderedDict()
+
+
+def payload_for(data: Any, parts: Optional[Sequence[Any]] = None, memo: bool = True) -> Payload:
+    """Return the memoized Payload for data.
+
+    When data is assembled per request from cached values (e.g. a wrapper
+    dict), pass those values as parts so the memo keys on them instead.
+    memo=False builds a one-off Payload for data that is new on every
+    request (e.g. a database page), which could never hit the memo and
+    would only push cached snapshots out of it.
+    """
+    if not memo:
+        return Payload(data)
+    sources = tuple(parts) if parts is not None else (data,)
+    key = tuple(id(source) for source in sources)
+    memo = _memo.get(key)
+    if memo is not None and all(a is b for a, b in zip(memo[0], sources)):
+        _memo.move_to_end(key)
+        return memo[1]
+    payload = Payload(data)
+    # Holding references keeps the ids from being reused while memoized
+    _memo[key] = (sources, payload)
+    while len(_memo) > PAYLOAD_MEMO_SIZE:
+        _memo.popitem(last=False)
+    return payload
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header, honouring q-values."""
+    available = {"gzip": 0.0, "br": 0.0}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding == "*":
+            for name in available:
+                available[name] = max(available[name], quality)
+        elif coding in available:
+            available[coding] = quality
+    if brotli is None:
+        available["br"] = 0.0
+    best = max(("br", "gzip"), key=lambda name: available[name])
+    return best if available[best] > 0 else None
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def cache_control(max_age: int, stale_while_revalidate: Optional[int] = None) -> str:
+    value = f"public, max-age={max_age}"
+    if stale_while_revalidate:
+        value += f", stale-while-revalidate={stale_while_revalidate}"
+    return value
+
+
+# Last good payload per request URL (path and query string)
+_last_payloads: "OrderedDict[str, Payload]" = OrderedDict()
+
+
+def _url_key(request: Request) -> str:
+    query = request.url.query
+    return f"{request.url.path}?{query}" if query else request.url.path
+
+
+def remember_payload(request: Request, payload: Payload) -> None:
+    key = _url_key(request)
+    _last_payloads[key] = payload
+    _last_payloads.move_to_end(key)
+    while len(_last_payloads) > LAST_PAYLOAD_SIZE:
+        _last_payloads.popitem(last=False)
+
+
+def stale_response(request: Request) -> Optional[Response]:
+    """Replay the last payload sent for this URL, or None if there is none."""
+    payload = _last_payloads.get(_url_key(request))
+    if payload is None:
+        return None
+    headers = {"Vary": "Accept-Encoding", "ETag": payload.etag, "Cache-Control": "no-cache", "X-Served-Stale": "1"}
+    return _send(request, payload, headers)
+
+
+def json_response(
+    request: Request,
+    data: Any,
+    max_age: Optional[int] = None,
+    parts: Optional[Sequence[Any]] = None,
+    memo: bool = True,
+) -> Response:
+    """Send data as compact JSON, compressed per Accept-Encoding, without re-encoding cached payloads.
+
+    Carries a content-hash ETag and answers a matching If-None-Match with
+    304; max_age adds a public Cache-Control header for CDNs and browsers.
+    """
+    payload = payload_for(data, parts, memo)
+    remember_payload(request, payload)
+    headers = {"Vary": "Accept-Encoding", "ETag": payload.etag}
+    if max_age is not None:
+        headers["Cache-Control"] = cache_control(max_age, stale_while_revalidate=max_age)
+    return _send(request, payload, headers)
+
+
+def _send(request: Request, payload: Payload, headers: Dict[str, str]) -> Response:
+    if etag_matches(request.headers.get("if-none-match", ""), payload.etag):
+        return Response(status_code=304, headers=headers)
+
+    encoding = None
+    if len(payload.body) >= MIN_COMPRESS_SIZE:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=payload.encoded(encoding), media_type="application/json", headers=headers)
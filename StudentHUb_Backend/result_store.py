@@ -0,0 +1,112 @@
+# backend/result_store.py
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from .database import SessionLocal, bulk_upsert
+from .models import LLMResult
+
+
+def _utcnow() -> datetime:
+    # Stored as naive UTC so SQLite and Postgres compare the same way
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+class ResultStore:
+    """Parsed LLM payloads persisted in SQL and shared by every worker."""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    def get(self, key: str, max_age: Optional[float] = None, include_expired: bool = False) -> Optional[Any]:
+        now = _utcnow()
+        query = select(LLMResult.payload).where(LLMResult.key == key)
+        if not include_expired:
+            query = query.where(LLMResult.expires_at > now)
+        if max_age is not None:
+            query = query.where(LLMResult.fetched_at > now - timedelta(seconds=max_age))
+        with self.session_factory() as db:
+            return db.execute(query).scalar_one_or_none()
+
+    def put_many(self, entries: List[Dict[str, Any]]) -> None:
+        """Upsert entries of the form {"key", "prompt", "payload", "ttl"}."""
+        now = _utcnow()
+        rows = [
+            {
+                "key": entry["key"],
+                "prompt_hash": prompt_hash(entry["prompt"]),
+                "payload": entry["payload"],
+                "fetched_at": now,
+                "expires_at": now + timedelta(seconds=entry["ttl"]),
+            }
+            for entry in entries
+        ]
+        with self.session_factory() as db:
+            bulk_upsert(
+                db,
+                LLMResult.__table__,
+                rows,
+                index_elements=["key"],
+                update_columns=["prompt_hash", "payload", "fetched_at", "expires_at"],
+            )
+            db.commit()
+
+    def put(self, key: str, prompt: str, payload: Any, ttl: float) -> None:
+        self.put_many([{"key": key, "prompt": prompt, "payload": payload, "ttl": ttl}])
+
+    async def load(self, key: str, max_age: Optional[float] = None, include_expired: bool = False) -> Optional[Any]:
+        """Async lookup; a database error is logged and reported as a miss."""
+        try:
+            return await run_in_threadpool(self.get, key, max_age, include_expired)
+        except SQLAlchemyError as e:
+            print(f"❌ Result store read failed for {key}: {e}")
+            return None
+
+    async def save(self, key: str, prompt: str, payload: Any, ttl: float) -> None:
+        """Async write; a database error is logged and otherwise ignored."""
+        try:
+            await run_in_threadpool(self.put, key, prompt, payload, ttl)
+        except SQLAlchemyError as e:
+            print(f"❌ Result store write failed for {key}: {e}")
+
+    async def read_through(
+        self,
+        key: str,
+        prompt: str,
+        ttl: float,
+        fetch: Callable[[], Awaitable[Any]],
+        max_age: Optional[float] = None,
+    ) -> Any:
+        """Return the stored payload for key, or fetch upstream and store it.
+
+        A database error never blocks the upstream path; it is logged and the
+        call falls through to fetch(). If fetch() fails, an expired row is
+        served as the last good payload before the error is re-raised.
+        """
+        payload = await self.load(key, max_age)
+        if payload is not None:
+            return payload
+
+        try:
+            payload = await fetch()
+        except Exception:
+            last_good = await self.load(key, include_expired=True)
+            if last_good is None:
+                raise
+            print(f"❌ Upstream fetch failed for {key}, serving last good payload")
+            return last_good
+        if payload:
+            await self.save(key, prompt, payload, ttl)
+        return payload
+
+
+# Shared store for the fixed-prompt LLM endpoints
+result_store = ResultStore()
@@ -0,0 +1,104 @@
+# backend/routers/admin.py
+import hmac
+import os
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from ..admission import admission_controller
+from ..broadcast import alert_hub
+from ..cache import response_cache
+from ..limiter import outbound_limiter
+from ..resilience import upstream_breaker, upstream_retry_budget
+from ..scheduler import maintenance_scheduler, prefetch_scheduler
+from ..search_cache import search_cache
+from ..search_index import search_index
+from ..singleflight import upstream_flights
+from ..suggest import suggest_index
+from ..trending import trending_queries
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+
+# Require the X-Admin-Token header; the admin API stays closed until ADMIN_TOKEN is set
+def require_admin(x_admin_token: str | None = Header(default=None)):
+    if not ADMIN_TOKEN or x_admin_token is None:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    if not hmac.compare_digest(x_admin_token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/cache")
+async def cache_stats():
+    return response_cache.stats()
+
+
+@router.get("/singleflight")
+async def singleflight_stats():
+    return {
+        "upstream": upstream_flights.stats(),
+        "response_cache": response_cache.flights.stats(),
+    }
+
+
+@router.get("/jobs")
+async def prefetch_jobs():
+    return prefetch_scheduler.status()
+
+
+@router.get("/maintenance")
+async def maintenance_jobs():
+    return maintenance_scheduler.status()
+
+
+@router.post("/jobs/{name}/refresh")
+async def refresh_job(name: str):
+    try:
+        await prefetch_scheduler.run_job(name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return {"message": "Job refreshed"}
+
+
+@router.get("/search-cache")
+async def search_cache_stats():
+    return search_cache.stats()
+
+
+@router.get("/search-index")
+async def search_index_stats():
+    return search_index.stats()
+
+
+@router.get("/suggest")
+async def suggest_stats():
+    return suggest_index.stats()
+
+
+@router.get("/trending")
+async def trending_stats():
+    return trending_queries.stats()
+
+
+@router.get("/upstream")
+async def upstream_stats():
+    return {
+        "circuit_breaker": upstream_breaker.stats(),
+        "retry_budget": upstream_retry_budget.stats(),
+    }
+
+
+@router.get("/limiter")
+async def limiter_stats():
+    return outbound_limiter.stats()
+
+
+@router.get("/admission")
+async def admission_stats():
+    return admission_controller.stats()
+
+
+@router.get("/alerts-hub")
+async def alerts_hub_stats():
+    return alert_hub.stats()
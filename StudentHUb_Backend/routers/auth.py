@@ -1,14 +1,18 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import random
 
-from ..database import get_db
-from ..models import User
+from ..database import get_async_db
+from ..otp_store import OTP_SWEEP_INTERVAL, otp_store
+from ..scheduler import maintenance_scheduler
+from ..tokens import require_session, token_signer
+from ..users import upsert_verified_user
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
-otp_store = {}
+# Bulk-delete expired codes in the background; reads also skip them lazily
+maintenance_scheduler.register("otp_sweep", otp_store.sweep, interval=OTP_SWEEP_INTERVAL)
 
 class OTPRequest(BaseModel):
     phone: str
@@ -21,23 +25,33 @@ class OTPVerifyRequest(BaseModel):
 @router.post("/login")
 async def send_otp(request: OTPRequest):
     otp = random.randint(1000, 9999)
-    otp_store[request.phone] = otp
+    await otp_store.put(request.phone, str(otp))
     print(f"DEBUG OTP for {request.phone}: {otp}")  # Simulate SMS
     return {"message": "OTP sent"}
 
 @router.post("/verify")
-async def verify_otp(request: OTPVerifyRequest, db: Session = Depends(get_db)):
-    if otp_store.get(request.phone) != request.otp:
+async def verify_otp(request: OTPVerifyRequest, db: AsyncSession = Depends(get_async_db)):
+    if not await otp_store.verify(request.phone, str(request.otp)):
         raise HTTPException(status_code=400, detail="Invalid OTP")
 
-    user = db.query(User).filter(User.phone == request.phone).first()
-
-    if not user:
-        user = User(phone=request.phone, location=request.location, is_verified=True)
-        db.add(user)
-    else:
-        user.is_verified = True
-        user.location = request.location
-
-    db.commit()
-    return {"message": "OTP verified", "user": {"phone": user.phone, "location": user.location}}
+    # One round-trip, and no race between concurrent verifies of the same phone
+    user = await upsert_verified_user(db, request.phone, request.location)
+    await db.commit()
+    token, expires_at = token_signer.issue(user["phone"], uid=user["id"])
+    return {
+        "message": "OTP verified",
+        "user": {"phone": user["phone"], "location": user["location"]},
+        "token": token,
+        "token_type": "bearer",
+        "expires_at": expires_at,
+    }
+
+@router.get("/me")
+async def me(session: dict = Depends(require_session)):
+    # Served from the token's claims; no database lookup
+    return {"phone": session["sub"], "user_id": session.get("uid"), "expires_at": session["exp"]}
+
+@router.post("/logout")
+async def logout(session: dict = Depends(require_session)):
+    token_signer.revoke(session)
+    return {"message": "Logged out"}
@@ -1,17 +1,27 @@
-import requests 
+import httpx
 import os
-import json
-import re
-from dotenv import load_dotenv
-from fastapi import FastAPI, APIRouter, HTTPException, Response
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-# Load environment variables
-load_dotenv()
-PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY")
-if not PERPLEXITY_API_KEY:
-    raise ValueError("API Key not found! Ensure PERPLEXITY_API_KEY is set in your .env file.")
+from ..cache import make_key, response_cache
+from ..college_catalog import MAX_PAGE_SIZE, SORTS, InvalidCursor, list_colleges, upsert_colleges
+from ..database import get_async_db
+from ..llm_json import extract_json_from_response
+from ..perplexity import chat_completion
+from ..responses import json_response
+from ..result_store import result_store
+from ..streaming import NDJSON_MEDIA_TYPE, STREAM_HEADERS, stream_json_array
+
+# Browser/CDN max-age for the list (seconds)
+CACHE_MAX_AGE = 60 * 60
+# Upstream budget per request, retries included (seconds)
+UPSTREAM_DEADLINE = float(os.getenv("COLLEGES_DEADLINE", "60"))
+# Cache lifetime for the top colleges list (seconds)
+CACHE_TTL = float(os.getenv("COLLEGES_CACHE_TTL", str(24 * 60 * 60)))
+TOP_COLLEGES_PROMPT = "List the top 10 engineering colleges in India."
 
 # Initialize FastAPI app and Router
 app = FastAPI(title="Student Hub API")
@@ -47,84 +57,90 @@ class CollegeSearchRequest(BaseModel):
     query: str = "List the top 10 engineering colleges in India."
 
 
-# Helper: Extract JSON content from AI response
-def extract_json_from_response(content: str) -> List[dict]:
-    try:
-        return json.loads(content)
-    except json.JSONDecodeError:
-        json_match = re.search(r"```json\s*(\[[\s\S]*?\])\s*```", content, re.DOTALL)
-        if json_match:
-            try:
-                return json.loads(json_match.group(1))
-            except json.JSONDecodeError:
-                raise ValueError("Failed to extract valid JSON from AI response.")
-
-    raise ValueError("No valid JSON found in AI response.")
-
-
 # Helper: Query Perplexity AI and handle responses
-def query_perplexity(prompt: str) -> List[dict]:
-    url = "https://api.perplexity.ai/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {PERPLEXITY_API_KEY}",
-        "Content-Type": "application/json",
-    }
-    payload = {
-        "model": "sonar",
-        "messages": [
-            {"role": "system", "content": INSTRUCTIONS},
-            {"role": "user", "content": prompt}
-        ],
-        "max_tokens": 3000
-    }
-
+async def query_perplexity(prompt: str) -> List[dict]:
     try:
-        print(f"🔹 Sending Query to Perplexity AI: {prompt}")
-        response = requests.post(url, json=payload, headers=headers)
-        response.raise_for_status()
-
-        # Log raw AI response for debugging
-        print("🔹 Raw AI Response:", response.text)
-
-        data = response.json()
-
-        # Validate AI response structure
-        if "choices" not in data or not data["choices"]:
-            raise ValueError("Invalid AI response structure: 'choices' missing.")
-
-        # Extract combined content from 'message' and 'delta'
-        content = "".join(
-            choice.get("message", {}).get("content", "") +
-            choice.get("delta", {}).get("content", "")
-            for choice in data["choices"]
-        )
-
-        if not content:
-            raise ValueError("Empty content in AI response.")
-
+        content = await chat_completion(INSTRUCTIONS, prompt, max_tokens=3000, deadline=UPSTREAM_DEADLINE)
         return extract_json_from_response(content)
 
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=502, detail=f"API request failed: {str(e)}")
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
 
+# Helper: Read the shared result store before calling upstream
+async def load_top_colleges() -> List[dict]:
+    colleges = await result_store.read_through(
+        make_key("colleges", "top", TOP_COLLEGES_PROMPT),
+        TOP_COLLEGES_PROMPT,
+        CACHE_TTL,
+        lambda: query_perplexity(TOP_COLLEGES_PROMPT),
+    )
+    await store_top_colleges(colleges)
+    return colleges
+
+
+# Helper: Keep the indexed catalog in step with each fresh list (loaded or streamed)
+async def store_top_colleges(colleges: List[dict]) -> None:
+    await upsert_colleges(colleges)
+
+
 # API Route: Fetch Top Colleges
 @router.get("/")
-async def get_top_colleges():
+async def get_top_colleges(
+    request: Request,
+    stream: str | None = Query(default=None, enum=["ndjson"]),
+    state: str | None = None,
+    grade: str | None = None,
+    min_rank: int | None = Query(default=None, ge=1),
+    max_rank: int | None = Query(default=None, ge=1),
+    sort: str = Query(default="rank", enum=list(SORTS)),
+    limit: int = Query(default=20, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
     print("🔹 Received GET request for top engineering colleges.")
+    if stream == "ndjson":
+        # Send each college as soon as the LLM finishes generating it
+        return StreamingResponse(
+            stream_json_array(
+                make_key("colleges", "top", TOP_COLLEGES_PROMPT), INSTRUCTIONS, TOP_COLLEGES_PROMPT, CACHE_TTL,
+                deadline=UPSTREAM_DEADLINE, on_result=store_top_colleges,
+            ),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=STREAM_HEADERS,
+        )
+    # Refill the catalog in the background when the list expires; the
+    # request is served from the catalog without waiting on the LLM
+    refilling = response_cache.refresh_in_background(
+        make_key("colleges", "top", TOP_COLLEGES_PROMPT),
+        load_top_colleges,
+        ttl=CACHE_TTL,
+    )
     try:
-        colleges = query_perplexity("List the top 10 engineering colleges in India.")
-
-        if not colleges:
-            raise HTTPException(status_code=404, detail="No colleges found.")
-
-        return Response(content=json.dumps(colleges, indent=2), media_type="application/json")
-
+        colleges, next_cursor = await list_colleges(
+            db, state=state, grade=grade, min_rank=min_rank, max_rank=max_rank,
+            sort=sort, limit=limit, cursor=cursor,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Error fetching colleges: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
+    if not colleges and cursor is None:
+        if refilling:
+            raise HTTPException(status_code=503, detail="College list is loading; retry shortly.", headers={"Retry-After": "5"})
+        raise HTTPException(status_code=404, detail="No colleges found.")
+
+    # Pages are built per request from the catalog, so there is nothing to memoize
+    response = json_response(request, colleges, max_age=CACHE_MAX_AGE, memo=False)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
+
 
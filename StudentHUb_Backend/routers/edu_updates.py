@@ -1,16 +1,32 @@
-import requests
+import httpx
 import os
-import json
-import re
-from dotenv import load_dotenv
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-load_dotenv()
-PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY")
-
-if not PERPLEXITY_API_KEY:
-    raise ValueError("API Key not found! Ensure PERPLEXITY_API_KEY is set in your .env file.")
+from ..cache import make_key, response_cache
+from ..college_catalog import InvalidCursor
+from ..database import get_async_db
+from ..llm_json import extract_json_from_response
+from ..news_store import NEWS_MAX_PAGE_SIZE, NEWS_PAGE_SIZE, append_news, list_news
+from ..perplexity import chat_completion
+from ..responses import json_response
+from ..result_store import result_store
+from ..scheduler import prefetch_scheduler
+from ..search_index import search_index
+from ..streaming import NDJSON_MEDIA_TYPE, STREAM_HEADERS, stream_json_array
+
+# Browser/CDN max-age for the feed (seconds)
+CACHE_MAX_AGE = 5 * 60
+# Upstream budget per request, retries included (seconds)
+UPSTREAM_DEADLINE = float(os.getenv("EDUCATION_DEADLINE", "60"))
+# Cache lifetime for the news feed (seconds)
+CACHE_TTL = float(os.getenv("EDUCATION_CACHE_TTL", str(30 * 60)))
+# Background refresh interval for the prefetched snapshot (seconds)
+REFRESH_INTERVAL = float(os.getenv("EDUCATION_REFRESH_INTERVAL", str(20 * 60)))
+EDUCATION_PROMPT = "Give me the latest educational news from India."
+NEWS_SOURCE = "education"
 
 router = APIRouter(prefix="/api/education", tags=["education"])
 
@@ -36,67 +52,87 @@ Only respond with a valid JSON array like this:
 Only include **real data**, not placeholders. Ensure URLs are valid links from reliable sources like ndtv.com, indianexpress.com, timesofindia.com, etc.
 """
 
-def extract_json_from_response(content: str) -> List[dict]:
-    try:
-        return json.loads(content)
-    except json.JSONDecodeError:
-        json_match = re.search(r"```json\s*(\[[\s\S]*?\])\s*```", content, re.DOTALL)
-        if json_match:
-            cleaned_json = json_match.group(1).strip()
-            if cleaned_json.endswith(","):
-                cleaned_json = cleaned_json.rstrip(",") + "]"
-            return json.loads(cleaned_json)
-    raise ValueError("No valid JSON found in AI response.")
-def query_perplexity(prompt: str) -> List[dict]:
-    url = "https://api.perplexity.ai/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {PERPLEXITY_API_KEY}",
-        "Content-Type": "application/json",
-    }
-    payload = {
-        "model": "sonar",
-        "messages": [
-            {"role": "system", "content": INSTRUCTIONS},
-            {"role": "user", "content": prompt}
-        ],
-        "max_tokens": 3000
-    }
-
+async def query_perplexity(prompt: str) -> List[dict]:
     try:
-        print(f"🔹 Sending Query to Perplexity AI: {prompt}")
-        response = requests.post(url, json=payload, headers=headers)
-        response.raise_for_status()
+        content = await chat_completion(INSTRUCTIONS, prompt, max_tokens=3000, deadline=UPSTREAM_DEADLINE)
+        return extract_json_from_response(content)
 
-        print("🔹 Raw AI Response:", response.text)  # Helps with debugging
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"API request failed: {str(e)}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
-        data = response.json()
 
-        if "choices" not in data or not data["choices"]:
-            raise ValueError("Invalid AI response structure: 'choices' missing.")
+# Read the shared result store before calling upstream; max_age lets a
+# scheduled refresh reuse a result another worker fetched moments ago
+async def load_education_updates(max_age: float | None = None) -> List[dict]:
+    items = await result_store.read_through(
+        make_key("education", "latest", EDUCATION_PROMPT),
+        EDUCATION_PROMPT,
+        CACHE_TTL,
+        lambda: query_perplexity(EDUCATION_PROMPT),
+        max_age=max_age,
+    )
+    await store_education_updates(items)
+    return items
 
-        content = "".join(
-            choice.get("message", {}).get("content", "") +
-            choice.get("delta", {}).get("content", "")
-            for choice in data["choices"]
-        )
 
-        if not content:
-            raise ValueError("Empty content in AI response.")
+# Append each fresh batch (loaded or streamed) to the news store and search index
+async def store_education_updates(items: List[dict]) -> None:
+    await append_news(items, NEWS_SOURCE)
+    search_index.add_news(items)
 
-        return extract_json_from_response(content)
 
-    except requests.RequestException as e:
-        raise HTTPException(status_code=502, detail=f"API request failed: {str(e)}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+# Keep the feed warm in the background
+prefetch_scheduler.register("education", lambda: load_education_updates(max_age=REFRESH_INTERVAL / 2), interval=REFRESH_INTERVAL)
 
 
 # ✅ API route
 @router.get("/")
-def get_education_updates():
-    prompt = "Give me the latest educational news from India."
+async def get_education_updates(
+    request: Request,
+    stream: str | None = Query(default=None, enum=["ndjson"]),
+    since: str | None = None,
+    limit: int = Query(default=NEWS_PAGE_SIZE, ge=1, le=NEWS_MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if stream == "ndjson":
+        # Send each article as soon as the LLM finishes generating it
+        return StreamingResponse(
+            stream_json_array(
+                make_key("education", "latest", EDUCATION_PROMPT), INSTRUCTIONS, EDUCATION_PROMPT, CACHE_TTL,
+                snapshot=prefetch_scheduler.snapshot("education"),
+                deadline=UPSTREAM_DEADLINE, on_result=store_education_updates,
+            ),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=STREAM_HEADERS,
+        )
+    key = make_key("education", "latest", EDUCATION_PROMPT)
+    # Each refresh appends to the news store, which answers every page; without a
+    # prefetched snapshot, refill in the background instead of waiting on the LLM
+    updates = prefetch_scheduler.snapshot("education")
+    refilling = False
+    if updates is None:
+        refilling = response_cache.refresh_in_background(key, load_education_updates, ttl=CACHE_TTL)
+        updates = response_cache.get(key, allow_stale=True)
     try:
-        updates = query_perplexity(prompt)
-        return updates
+        items, next_cursor = await list_news(db, NEWS_SOURCE, since=since, limit=limit)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+    if not items and since is None:
+        if not updates and refilling:
+            raise HTTPException(status_code=503, detail="News feed is loading; retry shortly.", headers={"Retry-After": "5"})
+        # Nothing stored yet (e.g. the database is unavailable): serve the latest batch
+        items = updates or []
+        response = json_response(request, items, max_age=CACHE_MAX_AGE)
+    else:
+        # Pages are built per request from the news store, so there is nothing to memoize
+        response = json_response(request, items, max_age=CACHE_MAX_AGE, memo=False)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
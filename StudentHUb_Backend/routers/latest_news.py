@@ -1,17 +1,29 @@
-import requests
+import httpx
 import os
-import json
-import re
-from dotenv import load_dotenv
-from fastapi import FastAPI, APIRouter, HTTPException, Query, Response
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List
 
-# Load environment variables
-load_dotenv()
-PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY")
-if not PERPLEXITY_API_KEY:
-    raise ValueError("API Key not found! Ensure PERPLEXITY_API_KEY is set in your .env file.")
+from ..broadcast import alert_hub
+from ..cache import make_key, response_cache
+from ..llm_json import extract_json_from_response
+from ..perplexity import chat_completion
+from ..responses import json_response
+from ..result_store import result_store
+from ..scheduler import prefetch_scheduler
+from ..search_index import search_index
+from ..singleflight import upstream_flights
+from ..streaming import NDJSON_MEDIA_TYPE, STREAM_HEADERS, stream_json_array
+
+# Browser/CDN max-age for each alert category (seconds)
+CACHE_MAX_AGE = 5 * 60
+# Upstream budget per request, retries included (seconds)
+UPSTREAM_DEADLINE = float(os.getenv("ALERTS_DEADLINE", "90"))
+# Cache lifetime for each alert category (seconds)
+CACHE_TTL = float(os.getenv("ALERTS_CACHE_TTL", str(60 * 60)))
+# Background refresh interval for each prefetched category (seconds)
+REFRESH_INTERVAL = float(os.getenv("ALERTS_REFRESH_INTERVAL", str(45 * 60)))
 
 # Initialize FastAPI app and Router
 app = FastAPI(title="Student Hub API")
@@ -42,80 +54,115 @@ The response MUST be a JSON array. Example format:
 ]
 """
 
-# Helper: Extract JSON content from AI response
-def extract_json_from_response(content: str) -> List[dict]:
-    try:
-        return json.loads(content)
-    except json.JSONDecodeError:
-        json_match = re.search(r"\[\s*{.*?}\s*\]", content, re.DOTALL)
-        if json_match:
-            try:
-                return json.loads(json_match.group(0))
-            except json.JSONDecodeError:
-                raise ValueError("Failed to extract valid JSON from AI response.")
-
-    raise ValueError("No valid JSON found in AI response.")
+CATEGORY_PROMPTS = {
+    "exam_alerts": "List the latest upcoming entrance exams in India with details.",
+    "college_alerts": "List recent college updates in India, including new courses and announcements.",
+    "admission_alerts": "List ongoing and upcoming college admissions in India."
+}
+DEFAULT_PROMPT = "Provide general education news."
 
 # Helper: Query Perplexity AI and handle responses
-def query_perplexity(category: str) -> List[dict]:
-    category_prompts = {
-        "exam_alerts": "List the latest upcoming entrance exams in India with details.",
-        "college_alerts": "List recent college updates in India, including new courses and announcements.",
-        "admission_alerts": "List ongoing and upcoming college admissions in India."
-    }
-
-    prompt = category_prompts.get(category, "Provide general education news.")
-
-    url = "https://api.perplexity.ai/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {PERPLEXITY_API_KEY}",
-        "Content-Type": "application/json",
-    }
-    payload = {
-        "model": "sonar",
-        "messages": [
-            {"role": "system", "content": INSTRUCTIONS},
-            {"role": "user", "content": prompt}
-        ],
-        "max_tokens": 3000
-    }
+async def query_perplexity(category: str) -> List[dict]:
+    prompt = CATEGORY_PROMPTS.get(category, DEFAULT_PROMPT)
 
     try:
-        response = requests.post(url, json=payload, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-
-        if "choices" not in data or not data["choices"]:
-            raise ValueError("Invalid AI response structure: 'choices' missing.")
-
-        content = "".join(
-            choice.get("message", {}).get("content", "") +
-            choice.get("delta", {}).get("content", "")
-            for choice in data["choices"]
+        content = await upstream_flights.do(
+            make_key("alerts", category, prompt),
+            lambda: chat_completion(INSTRUCTIONS, prompt, max_tokens=3000, deadline=UPSTREAM_DEADLINE),
         )
-
-        if not content:
-            raise ValueError("Empty content in AI response.")
-
         return extract_json_from_response(content)
 
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=502, detail=f"API request failed: {str(e)}")
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
+# Read the shared result store before calling upstream; max_age lets a
+# scheduled refresh reuse a result another worker fetched moments ago
+async def load_alerts(category: str, max_age: float | None = None) -> List[dict]:
+    prompt = CATEGORY_PROMPTS.get(category, DEFAULT_PROMPT)
+    items = await result_store.read_through(
+        make_key("alerts", category, prompt),
+        prompt,
+        CACHE_TTL,
+        lambda: query_perplexity(category),
+        max_age=max_age,
+    )
+    await publish_alerts(category, items)
+    return items
+
+# Helper: Index each fresh list (loaded or streamed); subscribers get only what changed
+async def publish_alerts(category: str, items: List[dict]) -> None:
+    search_index.add_news(items)
+    alert_hub.publish(category, items)
+
+# Helper: Serve alerts from the prefetched snapshot, falling back to the response cache
+async def fetch_alerts(category: str) -> List[dict]:
+    snapshot = prefetch_scheduler.snapshot(f"alerts:{category}")
+    if snapshot is not None:
+        return snapshot
+    prompt = CATEGORY_PROMPTS.get(category, DEFAULT_PROMPT)
+    return await response_cache.get_or_fetch(
+        make_key("alerts", category, prompt),
+        lambda: load_alerts(category),
+        ttl=CACHE_TTL,
+    )
+
+# Keep every category warm in the background
+for _category in CATEGORY_PROMPTS:
+    prefetch_scheduler.register(f"alerts:{_category}", lambda c=_category: load_alerts(c, max_age=REFRESH_INTERVAL / 2), interval=REFRESH_INTERVAL)
+
 # API Route: Fetch Alerts based on category
 @router.get("/")
-async def get_alerts(category: str = Query(..., enum=["exam_alerts", "college_alerts", "admission_alerts"])):
+async def get_alerts(
+    request: Request,
+    category: str = Query(..., enum=["exam_alerts", "college_alerts", "admission_alerts"]),
+    stream: str | None = Query(default=None, enum=["ndjson"]),
+):
+    if stream == "ndjson":
+        # Send each alert as soon as the LLM finishes generating it
+        prompt = CATEGORY_PROMPTS.get(category, DEFAULT_PROMPT)
+        return StreamingResponse(
+            stream_json_array(
+                make_key("alerts", category, prompt), INSTRUCTIONS, prompt, CACHE_TTL,
+                snapshot=prefetch_scheduler.snapshot(f"alerts:{category}"),
+                deadline=UPSTREAM_DEADLINE, on_result=lambda items: publish_alerts(category, items),
+            ),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=STREAM_HEADERS,
+        )
     try:
-        alerts = query_perplexity(category)
+        alerts = await fetch_alerts(category)
 
         if not alerts:
             raise HTTPException(status_code=404, detail="No alerts found.")
 
-        return Response(content=json.dumps(alerts, indent=2), media_type="application/json")
+        return json_response(request, alerts, max_age=CACHE_MAX_AGE)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
+
+
+# API Route: Subscribe to alert changes as server-sent events. Each connection
+# gets a "snapshot" event per category, then a "diff" event whenever a refresh
+# changes that category, all from the scheduler's one upstream fetch.
+@router.get("/subscribe")
+async def subscribe_alerts(categories: List[str] = Query(default=list(CATEGORY_PROMPTS))):
+    unknown = [category for category in categories if category not in CATEGORY_PROMPTS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown categories: {', '.join(unknown)}")
+
+    for category in categories:
+        if not alert_hub.has_state(category):
+            # First subscriber in this worker: load the category so the snapshot is not empty
+            try:
+                await fetch_alerts(category)
+            except Exception as e:
+                print(f"❌ Could not load {category} for subscribers: {e}")
+
+    subscription = alert_hub.subscribe(dict.fromkeys(categories))
+    if subscription is None:
+        raise HTTPException(status_code=503, detail="Too many alert subscribers.", headers={"Retry-After": "30"})
+    return StreamingResponse(alert_hub.stream(subscription), media_type="text/event-stream", headers=STREAM_HEADERS)
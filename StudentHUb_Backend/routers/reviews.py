@@ -1,19 +1,27 @@
 
-import requests
+import httpx
 import os
-import json
-import re
 import asyncio
-from dotenv import load_dotenv
-from fastapi import FastAPI, APIRouter, HTTPException, Query, Response
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel
 from typing import List
 
-# Load environment variables
-load_dotenv()
-PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY")
-if not PERPLEXITY_API_KEY:
-    raise ValueError("API Key not found! Ensure PERPLEXITY_API_KEY is set in your .env file.")
+from ..cache import make_key, response_cache
+from ..llm_json import extract_json_from_response
+from ..perplexity import chat_completion
+from ..responses import json_response
+from ..result_store import result_store
+from ..scheduler import prefetch_scheduler
+from ..singleflight import upstream_flights
+
+# Browser/CDN max-age for each insight category (seconds)
+CACHE_MAX_AGE = 15 * 60
+# Upstream budget per request, retries included (seconds)
+UPSTREAM_DEADLINE = float(os.getenv("INSIGHTS_DEADLINE", "90"))
+# Cache lifetime for each insight category (seconds)
+CACHE_TTL = float(os.getenv("INSIGHTS_CACHE_TTL", str(6 * 60 * 60)))
+# Background refresh interval for each prefetched category (seconds)
+REFRESH_INTERVAL = float(os.getenv("INSIGHTS_REFRESH_INTERVAL", str(4 * 60 * 60)))
 
 # Initialize FastAPI app and Router
 app = FastAPI(title="Student Hub API")
@@ -42,77 +50,67 @@ The response MUST be a JSON array. Example format:
 ]
 """
 
-# Helper to extract JSON content
-def extract_json_from_response(content: str) -> List[dict]:
-    try:
-        return json.loads(content)
-    except json.JSONDecodeError:
-        json_match = re.search(r"\[\s*{.*?}\s*\]", content, re.DOTALL)
-        if json_match:
-            try:
-                return json.loads(json_match.group(0))
-            except json.JSONDecodeError:
-                raise ValueError("Failed to extract valid JSON from AI response.")
-    raise ValueError("No valid JSON found in AI response.")
+CATEGORY_PROMPTS = {
+    "highest_packages": "List the top 10 colleges in India with the highest placement packages",
+    "trending_courses": "List the top 10 trending and in-demand courses in India.",
+    "trending_colleges": "List the most popular and trending 10 colleges in India based on recent rankings."
+}
+DEFAULT_PROMPT = "Provide general education insights."
 
 # Function to call Perplexity
-def query_perplexity(category: str) -> List[dict]:
-    category_prompts = {
-        "highest_packages": "List the top 10 colleges in India with the highest placement packages",
-        "trending_courses": "List the top 10 trending and in-demand courses in India.",
-        "trending_colleges": "List the most popular and trending 10 colleges in India based on recent rankings."
-    }
-
-    prompt = category_prompts.get(category, "Provide general education insights.")
-    url = "https://api.perplexity.ai/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {PERPLEXITY_API_KEY}",
-        "Content-Type": "application/json",
-    }
-    payload = {
-        "model": "sonar",
-        "messages": [
-            {"role": "system", "content": INSTRUCTIONS},
-            {"role": "user", "content": prompt}
-        ],
-        "max_tokens": 3000
-    }
+async def query_perplexity(category: str) -> List[dict]:
+    prompt = CATEGORY_PROMPTS.get(category, DEFAULT_PROMPT)
 
     try:
-        response = requests.post(url, json=payload, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-
-        if "choices" not in data or not data["choices"]:
-            raise ValueError("Invalid AI response structure: 'choices' missing.")
-
-        content = "".join(
-            choice.get("message", {}).get("content", "") +
-            choice.get("delta", {}).get("content", "")
-            for choice in data["choices"]
+        content = await upstream_flights.do(
+            make_key("data", category, prompt),
+            lambda: chat_completion(INSTRUCTIONS, prompt, max_tokens=3000, deadline=UPSTREAM_DEADLINE),
         )
-
-        if not content:
-            raise ValueError("Empty content in AI response.")
-
         return extract_json_from_response(content)
 
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=502, detail=f"API request failed: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
 
+# Read the shared result store before calling upstream; max_age lets a
+# scheduled refresh reuse a result another worker fetched moments ago
+async def load_insights(category: str, max_age: float | None = None) -> List[dict]:
+    prompt = CATEGORY_PROMPTS.get(category, DEFAULT_PROMPT)
+    return await result_store.read_through(
+        make_key("data", category, prompt),
+        prompt,
+        CACHE_TTL,
+        lambda: query_perplexity(category),
+        max_age=max_age,
+    )
+
+# Serve one insight category from the prefetched snapshot, falling back to the response cache
+async def fetch_insights(category: str) -> List[dict]:
+    snapshot = prefetch_scheduler.snapshot(f"data:{category}")
+    if snapshot is not None:
+        return snapshot
+    prompt = CATEGORY_PROMPTS.get(category, DEFAULT_PROMPT)
+    return await response_cache.get_or_fetch(
+        make_key("data", category, prompt),
+        lambda: load_insights(category),
+        ttl=CACHE_TTL,
+    )
+
+# Keep every category warm in the background
+for _category in CATEGORY_PROMPTS:
+    prefetch_scheduler.register(f"data:{_category}", lambda c=_category: load_insights(c, max_age=REFRESH_INTERVAL / 2), interval=REFRESH_INTERVAL)
+
 @router.get("/all")
-async def get_all_data():
+async def get_all_data(request: Request):
     try:
-        loop = asyncio.get_event_loop()
-        packages_task = loop.run_in_executor(None, query_perplexity, "highest_packages")
-        courses_task = loop.run_in_executor(None, query_perplexity, "trending_courses")
-        colleges_task = loop.run_in_executor(None, query_perplexity, "trending_colleges")
-
-        packages, courses, colleges = await asyncio.gather(packages_task, courses_task, colleges_task)
+        packages, courses, colleges = await asyncio.gather(
+            fetch_insights("highest_packages"),
+            fetch_insights("trending_courses"),
+            fetch_insights("trending_colleges"),
+        )
 
-        return {
+        body = {
             "status": "success",
             "message": "Fetched all insights successfully",
             "data": {
@@ -121,17 +119,19 @@ async def get_all_data():
                 "colleges": colleges
             }
         }
+        # Keyed on the three cached lists, so the wrapper is serialized once per refresh
+        return json_response(request, body, max_age=CACHE_MAX_AGE, parts=(packages, courses, colleges))
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
 
 # ✅ Optional: Individual Category Endpoint
 @router.get("/")
-async def get_data(category: str = Query(..., enum=["highest_packages", "trending_courses", "trending_colleges"])):
+async def get_data(request: Request, category: str = Query(..., enum=["highest_packages", "trending_courses", "trending_colleges"])):
     try:
-        data = query_perplexity(category)
+        data = await fetch_insights(category)
         if not data:
             raise HTTPException(status_code=404, detail="No data found.")
-        return Response(content=json.dumps(data, indent=2), media_type="application/json")
+        return json_response(request, data, max_age=CACHE_MAX_AGE)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
@@ -1,23 +1,32 @@
-import requests
+import httpx
 import os
 import re
-from dotenv import load_dotenv
-from fastapi import APIRouter, HTTPException
+from contextlib import aclosing
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
-
-# Load environment variables
-load_dotenv()
-PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY")
-if not PERPLEXITY_API_KEY:
-    raise ValueError("API Key not found! Ensure you have set PERPLEXITY_API_KEY in your .env file.")
+from typing import AsyncIterator, List, Dict, Any, Tuple
+
+from ..cache import make_key
+from ..limiter import Priority
+from ..perplexity import chat_completion, stream_chat_completion
+from ..scheduler import maintenance_scheduler
+from ..search_cache import search_cache
+from ..search_index import SEARCH_INDEX_SYNC_INTERVAL, search_index
+from ..singleflight import upstream_flights
+from ..streaming import STREAM_HEADERS, sse_event
+from ..suggest import SUGGEST_RELATED_WEIGHT, SUGGEST_REBUILD_INTERVAL, SUGGEST_TOP_K, suggest_index
+from ..trending import WINDOWS, trending_queries
 
 # FastAPI Router
 router = APIRouter(prefix="/api/search", tags=["search"])
 
+# Interactive queries get a tighter upstream budget than the list endpoints (seconds)
+UPSTREAM_DEADLINE = float(os.getenv("SEARCH_DEADLINE", "30"))
+
 instructions = """
 You are an AI assistant focused on education-related queries. Follow these rules:
-1. Provide structured responses with **relevant images, related queries, and user search trends**.
+1. Provide structured responses with **relevant images and related queries**.
 2. For **college-related queries**, include:
    - **Overview**: Name, location, and branches.
    - **Rankings & Reviews**: NIRF Rank, NAAC Grade, Overall Rating, Highest Package.
@@ -32,7 +41,6 @@ You are an AI assistant focused on education-related queries. Follow these rules
 
 4. **Suggest Exactly 5 Related Queries**:
    - Recommend exactly **5 similar searches** based on user intent.
-   - Show **trending searches** in education.
 
 5. **Ensure Accuracy**:
    - Cross-check details with sources like CollegeDunia, CollegeDekho, Shiksha, and official college websites.
@@ -71,42 +79,50 @@ def clean_response(text: str) -> str:
     text = re.sub(r"##+", "", text)  # Remove headings
     return text.strip()
 
-# Query Perplexity AI
-def query_perplexity(user_input: str) -> Dict[str, Any]:
-    url = "https://api.perplexity.ai/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {PERPLEXITY_API_KEY}",
-        "Content-Type": "application/json",
-        "Accept": "application/json"
-    }
-    payload = {
-        "model": "sonar",
-        "messages": [
-            {"role": "system", "content": instructions},
-            {"role": "user", "content": user_input}
-        ],
-        "max_tokens": 1500
+# Clean a streamed segment without trimming the whitespace between segments
+def clean_chunk(text: str) -> str:
+    text = re.sub(r"\*\*(.*?)\*\*", r"\1", text)
+    return re.sub(r"##+", "", text)
+
+# Split a stream buffer into a part that is safe to clean and send, and the rest
+def split_ready(buffer: str) -> Tuple[str, str]:
+    cut = max(buffer.rfind(" "), buffer.rfind("\n"))
+    if cut < 0:
+        return "", buffer
+    ready = buffer[:cut + 1]
+    if ready.count("**") % 2:
+        # Hold back an unterminated bold span until its closing marker arrives
+        ready = ready[:ready.rfind("**")]
+    return ready, buffer[len(ready):]
+
+# Fetch and parse one answer from Perplexity AI (raises on failure)
+async def fetch_answer(user_input: str) -> Dict[str, Any]:
+    # Identical concurrent queries share one upstream call
+    raw_text = await upstream_flights.do(
+        make_key("search", "query", user_input.strip()),
+        lambda: chat_completion(instructions, user_input, max_tokens=1500, deadline=UPSTREAM_DEADLINE, priority=Priority.INTERACTIVE),
+    )
+    images = extract_image_urls(raw_text)
+    related_queries = extract_related_queries(raw_text)
+    response_text = clean_response(raw_text)
+
+    result = {
+        "response": response_text,
+        "related_queries": related_queries,
+        "images": images
     }
+    search_index.add_answer(user_input, result)
+    for related in related_queries:
+        suggest_index.record(related, SUGGEST_RELATED_WEIGHT)
+    return result
 
+# Query Perplexity AI, serving near-duplicate queries from the search cache
+async def query_perplexity(user_input: str) -> Dict[str, Any]:
     try:
-        response = requests.post(url, json=payload, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-
-        if "choices" in data and data["choices"]:
-            raw_text = data["choices"][0]["message"]["content"]
-            images = extract_image_urls(raw_text)
-            related_queries = extract_related_queries(raw_text)
-            response_text = clean_response(raw_text)
-
-            return {
-                "response": response_text,
-                "related_queries": related_queries,
-                "images": images
-            }
-
+        return await search_cache.get_or_fetch(user_input, lambda: fetch_answer(user_input))
+    except ValueError:
         return {"response": "No valid response from Perplexity AI.", "related_queries": [], "images": []}
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         return {"response": f"Request Error: {e}", "related_queries": [], "images": []}
 
 # FastAPI Search Endpoint
@@ -115,13 +131,115 @@ async def search(request: SearchRequest):
     if not request.query:
         raise HTTPException(status_code=400, detail="Query cannot be empty.")
 
-    result = query_perplexity(request.query)
+    suggest_index.record(request.query)
+    trending_queries.record(request.query)
+    # Facts we already hold (catalog, news, past answers) skip the upstream call
+    result = search_index.answer(request.query)
+    message = "Response served from local index"
+    if result is None:
+        result = await query_perplexity(request.query)
+        message = "Response fetched successfully"
     return {
         "status": "success",
-        "message": "Response fetched successfully",
+        "message": message,
         "data": {
             "response": result["response"],
             "related_queries": result["related_queries"],
             "images": result["images"]
         }
     }
+
+# Stream one answer as server-sent events: "chunk" events carry cleaned text,
+# "images" events carry newly seen image URLs, then "related_queries" and "done"
+async def stream_answer(user_input: str) -> AsyncIterator[str]:
+    local = search_index.answer(user_input)
+    if local is not None:
+        yield sse_event("chunk", {"text": local["response"]})
+        yield sse_event("images", local["images"])
+        yield sse_event("related_queries", local["related_queries"])
+        yield sse_event("done", {"cached": True, "local": True})
+        return
+
+    cached = search_cache.get(user_input)
+    if cached is not None:
+        yield sse_event("chunk", {"text": cached["response"]})
+        yield sse_event("images", cached["images"])
+        yield sse_event("related_queries", cached["related_queries"])
+        yield sse_event("done", {"cached": True})
+        return
+
+    raw_parts: List[str] = []
+    seen_images: List[str] = []
+    buffer = ""
+    try:
+        # Close the upstream stream (and its outbound slot) as soon as the client goes away
+        async with aclosing(stream_chat_completion(
+            instructions, user_input, max_tokens=1500, deadline=UPSTREAM_DEADLINE, priority=Priority.INTERACTIVE
+        )) as deltas:
+            async for delta in deltas:
+                raw_parts.append(delta)
+                ready, buffer = split_ready(buffer + delta)
+                if not ready:
+                    continue
+                yield sse_event("chunk", {"text": clean_chunk(ready)})
+                new_images = [url for url in extract_image_urls(ready) if url not in seen_images]
+                if new_images:
+                    seen_images.extend(new_images)
+                    yield sse_event("images", new_images)
+    except httpx.HTTPError as e:
+        yield sse_event("error", {"detail": f"Request Error: {e}"})
+        return
+
+    if buffer:
+        yield sse_event("chunk", {"text": clean_chunk(buffer)})
+        new_images = [url for url in extract_image_urls(buffer) if url not in seen_images]
+        if new_images:
+            seen_images.extend(new_images)
+            yield sse_event("images", new_images)
+
+    raw_text = "".join(raw_parts)
+    related_queries = extract_related_queries(raw_text)
+    yield sse_event("related_queries", related_queries)
+
+    if raw_text:
+        # Let the non-streaming endpoint and the local index reuse this answer
+        result = {
+            "response": clean_response(raw_text),
+            "related_queries": related_queries,
+            "images": extract_image_urls(raw_text)
+        }
+        search_cache.set(user_input, result)
+        search_index.add_answer(user_input, result)
+        for related in related_queries:
+            suggest_index.record(related, SUGGEST_RELATED_WEIGHT)
+    yield sse_event("done", {"cached": False})
+
+# FastAPI Streaming Search Endpoint (EventSource-friendly GET)
+@router.get("/stream")
+async def search_stream(query: str):
+    if not query:
+        raise HTTPException(status_code=400, detail="Query cannot be empty.")
+
+    suggest_index.record(query)
+    trending_queries.record(query)
+    return StreamingResponse(stream_answer(query), media_type="text/event-stream", headers=STREAM_HEADERS)
+
+
+# FastAPI Suggestion Endpoint: prefix completions ranked by popularity
+@router.get("/suggest")
+async def suggest(q: str = "", limit: int = Query(default=SUGGEST_TOP_K, ge=1, le=SUGGEST_TOP_K)):
+    return suggest_index.suggest(q, limit)
+
+
+# FastAPI Trending Endpoint: the most searched queries, counted from real traffic
+@router.get("/trending")
+async def trending(window: str = "day", limit: int = Query(default=10, ge=1, le=50)):
+    if window not in WINDOWS:
+        raise HTTPException(status_code=400, detail=f"window must be one of: {', '.join(WINDOWS)}")
+    return trending_queries.top(window, limit)
+
+
+# Pull colleges written by other workers or the ingest CLI into the local index
+maintenance_scheduler.register("search_index:colleges", search_index.sync_colleges, interval=SEARCH_INDEX_SYNC_INTERVAL)
+# Fold new colleges and recorded queries into the suggestion snapshot
+maintenance_scheduler.register("search_suggest", suggest_index.refresh, interval=SUGGEST_REBUILD_INTERVAL)
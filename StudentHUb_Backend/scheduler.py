@@ -0,0 +1,123 @@
+# backend/scheduler.py
+import asyncio
+import os
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .limiter import Priority, upstream_priority
+
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "1").lower() not in ("0", "false", "no")
+PREFETCH_MAX_CONCURRENCY = int(os.getenv("PREFETCH_MAX_CONCURRENCY", "2"))
+# Upper bound (seconds) of the random delay before each job's first run
+PREFETCH_STARTUP_JITTER = float(os.getenv("PREFETCH_STARTUP_JITTER", "5"))
+MAINTENANCE_MAX_CONCURRENCY = int(os.getenv("MAINTENANCE_MAX_CONCURRENCY", "4"))
+
+
+@dataclass
+class PrefetchJob:
+    name: str
+    fetch: Callable[[], Awaitable[Any]]
+    interval: float
+    jitter: float
+    snapshot: Any = None
+    last_refresh: Optional[datetime] = None
+    last_duration: Optional[float] = None
+    last_error: Optional[str] = None
+    refreshes: int = 0
+    errors: int = 0
+    next_run: Optional[datetime] = None
+
+
+class PrefetchScheduler:
+    """Refreshes registered jobs on their own jittered interval.
+
+    Handlers read the latest snapshot with snapshot(name); a failed refresh
+    keeps the previous snapshot in place.
+    """
+
+    def __init__(self, max_concurrency: int = PREFETCH_MAX_CONCURRENCY, enabled: bool = PREFETCH_ENABLED):
+        self.max_concurrency = max_concurrency
+        self.enabled = enabled
+        self._jobs: Dict[str, PrefetchJob] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def register(self, name: str, fetch: Callable[[], Awaitable[Any]], interval: float, jitter: float = 0.1) -> PrefetchJob:
+        job = PrefetchJob(name=name, fetch=fetch, interval=interval, jitter=jitter)
+        self._jobs[name] = job
+        return job
+
+    def snapshot(self, name: str) -> Any:
+        job = self._jobs.get(name)
+        return job.snapshot if job is not None else None
+
+    async def start(self) -> None:
+        if self._tasks or not self.enabled:
+            return
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._tasks = [asyncio.create_task(self._loop(job)) for job in self._jobs.values()]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run_job(self, name: str) -> Any:
+        job = self._jobs[name]
+        semaphore = self._semaphore or asyncio.Semaphore(self.max_concurrency)
+        async with semaphore:
+            started = time.perf_counter()
+            # Prefetches yield outbound slots to interactive and dashboard calls
+            priority_token = upstream_priority.set(Priority.BACKGROUND)
+            try:
+                value = await job.fetch()
+            except Exception as e:
+                job.errors += 1
+                job.last_error = str(e)
+                print(f"❌ Prefetch job {name} failed: {e}")
+                return job.snapshot
+            finally:
+                upstream_priority.reset(priority_token)
+                job.last_duration = round(time.perf_counter() - started, 3)
+        job.snapshot = value
+        job.last_refresh = datetime.now(timezone.utc)
+        job.last_error = None
+        job.refreshes += 1
+        return value
+
+    async def _loop(self, job: PrefetchJob) -> None:
+        await asyncio.sleep(random.uniform(0, PREFETCH_STARTUP_JITTER))
+        while True:
+            await self.run_job(job.name)
+            delay = job.interval * random.uniform(1 - job.jitter, 1 + job.jitter)
+            job.next_run = datetime.fromtimestamp(time.time() + delay, timezone.utc)
+            await asyncio.sleep(delay)
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": job.name,
+                "interval": job.interval,
+                "jitter": job.jitter,
+                "has_snapshot": job.snapshot is not None,
+                "last_refresh": job.last_refresh.isoformat() if job.last_refresh else None,
+                "last_duration": job.last_duration,
+                "last_error": job.last_error,
+                "refreshes": job.refreshes,
+                "errors": job.errors,
+                "next_run": job.next_run.isoformat() if job.next_run else None,
+            }
+            for job in self._jobs.values()
+        ]
+
+
+# Shared schedulers, started from the FastAPI lifespan in main.py. Upstream
+# prefetches can be turned off with PREFETCH_ENABLED=0; local maintenance jobs
+# (OTP sweep, search index and suggestion rebuilds) always run and never wait
+# behind a slow LLM prefetch for a slot.
+prefetch_scheduler = PrefetchScheduler()
+maintenance_scheduler = PrefetchScheduler(max_concurrency=MAINTENANCE_MAX_CONCURRENCY, enabled=True)
@@ -0,0 +1,104 @@
+# backend/search_cache.py
+import os
+import re
+import time
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List
+
+from .cache import ResponseCache
+
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", str(6 * 60 * 60)))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "5000"))
+SEARCH_CACHE_MAX_BYTES = int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Interrogatives and comparison words (when, which, best, vs, ...) change what a
+# query asks for, so they stay in the key
+STOPWORDS = frozenset("""
+a an and are as at be by can do does for from give i in is it list me my of on or
+please show tell the this to what with about
+""".split())
+
+# Words the suffix rules would fold into a different word ("news" -> "new")
+STEM_EXCEPTIONS = frozenset({"news", "series", "species", "physics", "mathematics", "economics"})
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+# Vocabulary is small next to the number of tokens seen, so stem each word once
+@lru_cache(maxsize=65536)
+def _stem(token: str) -> str:
+    """Light suffix stripping; enough to fold plurals and simple verb forms."""
+    if len(token) <= 3 or token.isdigit() or token in STEM_EXCEPTIONS:
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith("sses"):
+        return token[:-2]
+    if token.endswith("ing") and len(token) > 5:
+        return token[:-3]
+    if token.endswith("ed") and len(token) > 4:
+        return token[:-2]
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, stemmed tokens with stopwords removed, in text order."""
+    return [_stem(token) for token in _TOKEN_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def canonicalize(query: str) -> str:
+    """Lowercase, drop punctuation and stopwords, stem, then sort the tokens.
+
+    "IIT bombay placements", "iit Bombay placement?" and "placements at IIT
+    Bombay" all map to "bombay iit placement".
+    """
+    terms = set(tokenize(query))
+    if not terms:
+        # All stopwords: fall back to the plain lowercased tokens
+        terms = set(_TOKEN_RE.findall(query.lower()))
+    return " ".join(sorted(terms))
+
+
+class SearchCache:
+    """Answer cache for /api/search keyed on the canonical query form."""
+
+    def __init__(
+        self,
+        ttl: float = SEARCH_CACHE_TTL,
+        max_entries: int = SEARCH_CACHE_MAX_ENTRIES,
+        max_bytes: int = SEARCH_CACHE_MAX_BYTES,
+    ):
+        self.ttl = ttl
+        self.cache = ResponseCache(max_entries=max_entries, max_bytes=max_bytes)
+        self.canonicalizations = 0
+        self.canonicalize_seconds = 0.0
+
+    def key(self, query: str) -> str:
+        started = time.perf_counter()
+        canonical = canonicalize(query)
+        self.canonicalize_seconds += time.perf_counter() - started
+        self.canonicalizations += 1
+        return f"search:{canonical}"
+
+    def get(self, query: str) -> Any:
+        return self.cache.get(self.key(query))
+
+    def set(self, query: str, value: Any) -> None:
+        self.cache.set(self.key(query), value, ttl=self.ttl)
+
+    async def get_or_fetch(self, query: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        return await self.cache.get_or_fetch(self.key(query), fetch, ttl=self.ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.cache.stats()
+        stats["canonicalizations"] = self.canonicalizations
+        stats["avg_canonicalize_us"] = (
+            round(self.canonicalize_seconds / self.canonicalizations * 1e6, 2) if self.canonicalizations else 0.0
+        )
+        return stats
+
+
+# Shared cache for /api/search answers
+search_cache = SearchCache()
@@ -0,0 +1,328 @@
+# backend/search_index.py
+import asyncio
+import math
+import os
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from .database import AsyncSessionLocal
+from .models import College
+from .search_cache import SEARCH_CACHE_TTL, canonicalize, tokenize
+
+SEARCH_INDEX_MAX_DOCS = int(os.getenv("SEARCH_INDEX_MAX_DOCS", "200000"))
+# Queries matching more documents than this are too broad to answer from one of them
+SEARCH_INDEX_MAX_CANDIDATES = int(os.getenv("SEARCH_INDEX_MAX_CANDIDATES", "2000"))
+# Share of a document's key terms (college name, headline, past query) the query must contain
+SEARCH_INDEX_MIN_COVERAGE = float(os.getenv("SEARCH_INDEX_MIN_COVERAGE", "0.8"))
+# How far the best match must score above the runner-up to be answered locally
+SEARCH_INDEX_MARGIN = float(os.getenv("SEARCH_INDEX_MARGIN", "1.2"))
+# How often new catalog rows are pulled into the index (seconds)
+SEARCH_INDEX_SYNC_INTERVAL = float(os.getenv("SEARCH_INDEX_SYNC_INTERVAL", str(5 * 60)))
+# Rows indexed between yields to the event loop during a sync
+SEARCH_INDEX_SYNC_CHUNK = int(os.getenv("SEARCH_INDEX_SYNC_CHUNK", "500"))
+
+# College column -> words a query uses to ask for it; only indexed when the value is known
+COLLEGE_FIELD_LABELS = [
+    ("location", "location"),
+    ("nirf_ranking", "nirf rank ranking"),
+    ("naac_grade", "naac grade"),
+    ("highest_package", "placement package salary highest"),
+    ("avg_package", "placement package salary average"),
+    ("fee_structure", "fee fees"),
+]
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+class _Doc:
+    __slots__ = ("doc_id", "kind", "terms", "length", "key_terms", "answer", "expires_at")
+
+    def __init__(
+        self,
+        doc_id: int,
+        kind: str,
+        terms: Dict[str, int],
+        key_terms: FrozenSet[str],
+        answer: Dict[str, Any],
+        expires_at: Optional[float] = None,
+    ):
+        self.doc_id = doc_id
+        self.kind = kind
+        self.terms = terms
+        self.length = sum(terms.values())
+        self.key_terms = key_terms
+        self.answer = answer
+        self.expires_at = expires_at
+
+
+def _line(label: str, value: Any) -> Optional[str]:
+    return f"{label}: {value}" if value not in (None, "") else None
+
+
+def college_answer(college: Dict[str, Any]) -> Dict[str, Any]:
+    name = college["name"]
+    lines = [
+        name,
+        _line("Location", college.get("location")),
+        _line("NIRF Rank", college.get("nirf_ranking")),
+        _line("NAAC Grade", college.get("naac_grade")),
+        _line("Highest Package", college.get("highest_package")),
+        _line("Average Package", college.get("avg_package")),
+        _line("Fee Structure", college.get("fee_structure")),
+    ]
+    return {
+        "response": "\n".join(line for line in lines if line),
+        "related_queries": [f"{name} {topic}" for topic in ("courses", "placements", "admission", "cutoff", "hostel")],
+        "images": [college["logo_url"]] if college.get("logo_url") else [],
+    }
+
+
+def news_answer(item: Dict[str, Any]) -> Dict[str, Any]:
+    lines = [
+        item.get("title"),
+        item.get("date"),
+        item.get("description") or item.get("details"),
+        _line("Read more", item.get("read_more_url")),
+    ]
+    return {
+        "response": "\n".join(str(line) for line in lines if line),
+        "related_queries": [],
+        "images": [item["image_url"]] if item.get("image_url") else [],
+    }
+
+
+class SearchIndex:
+    """In-process inverted index with BM25 ranking over colleges, news and past answers.
+
+    Each document carries a ready-made answer. answer() returns it only for a
+    confident match: every query term appears in the document, the query
+    covers most of the document's key terms, and the best score clears the
+    runner-up by SEARCH_INDEX_MARGIN. Adding a key that already exists
+    replaces the document; the oldest documents are evicted past max_docs,
+    and documents added with a ttl are dropped once a lookup finds them
+    expired.
+    """
+
+    def __init__(
+        self,
+        max_docs: int = SEARCH_INDEX_MAX_DOCS,
+        max_candidates: int = SEARCH_INDEX_MAX_CANDIDATES,
+        min_coverage: float = SEARCH_INDEX_MIN_COVERAGE,
+        margin: float = SEARCH_INDEX_MARGIN,
+    ):
+        self.max_docs = max_docs
+        self.max_candidates = max_candidates
+        self.min_coverage = min_coverage
+        self.margin = margin
+        self._docs: "OrderedDict[str, _Doc]" = OrderedDict()
+        self._keys: Dict[int, str] = {}
+        # term -> {doc_id: term frequency}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._total_length = 0
+        self._next_id = 0
+        self._colleges_synced_at = None
+        self.queries = 0
+        self.hits = 0
+        self.broad = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.query_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(
+        self, key: str, kind: str, text: str, key_text: str, answer: Dict[str, Any], ttl: Optional[float] = None
+    ) -> None:
+        terms = Counter(tokenize(text))
+        key_terms = frozenset(tokenize(key_text))
+        if not terms or not key_terms:
+            return
+        self.remove(key)
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        doc = _Doc(self._next_id, kind, dict(terms), key_terms, answer, expires_at)
+        self._next_id += 1
+        self._docs[key] = doc
+        self._keys[doc.doc_id] = key
+        self._total_length += doc.length
+        for term, tf in doc.terms.items():
+            self._postings.setdefault(term, {})[doc.doc_id] = tf
+        while len(self._docs) > self.max_docs:
+            self.remove(next(iter(self._docs)))
+            self.evictions += 1
+
+    def remove(self, key: str) -> bool:
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return False
+        del self._keys[doc.doc_id]
+        self._total_length -= doc.length
+        for term in doc.terms:
+            postings = self._postings[term]
+            del postings[doc.doc_id]
+            if not postings:
+                del self._postings[term]
+        return True
+
+    def add_colleges(self, colleges: Iterable[Dict[str, Any]]) -> int:
+        """Index catalog rows (dicts with the colleges table columns)."""
+        added = 0
+        for college in colleges:
+            name = college.get("name")
+            if not name:
+                continue
+            parts = [name]
+            for field, labels in COLLEGE_FIELD_LABELS:
+                value = college.get(field)
+                # A label without its value would let "<college> fees" match a card with no fees
+                if value not in (None, ""):
+                    parts.extend((labels, str(value)))
+            if college.get("is_private"):
+                parts.append("private")
+            text = " ".join(parts)
+            key = college.get("normalized_name") or canonicalize(name)
+            self.add(f"college:{key}", "college", text, name, college_answer(college))
+            added += 1
+        return added
+
+    def add_news(self, items: Iterable[Dict[str, Any]]) -> int:
+        """Index news or alert items (title, date, description/details, read_more_url)."""
+        added = 0
+        for item in items:
+            title = item.get("title") if isinstance(item, dict) else None
+            if not title:
+                continue
+            body = item.get("description") or item.get("details") or ""
+            key = item.get("read_more_url") or canonicalize(title)
+            self.add(f"news:{key}", "news", f"{title} {body}", title, news_answer(item))
+            added += 1
+        return added
+
+    def add_answer(self, query: str, result: Dict[str, Any], ttl: float = SEARCH_CACHE_TTL) -> None:
+        """Index a past /api/search answer under the query that produced it.
+
+        Answers can be time-sensitive (exam dates), so they expire with the
+        search cache instead of living until evicted.
+        """
+        if result.get("response"):
+            self.add(f"answer:{canonicalize(query)}", "answer", f"{query} {result['response']}", query, result, ttl=ttl)
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[str, float]]:
+        """(key, BM25 score) for documents containing every query term, best first."""
+        hits = self._rank(set(tokenize(query)))
+        return [(self._keys[doc_id], score) for score, doc_id in sorted(hits, reverse=True)[:limit]]
+
+    def _rank(self, terms: set) -> List[Tuple[float, int]]:
+        if not terms or not self._docs:
+            return []
+        postings = []
+        for term in terms:
+            term_postings = self._postings.get(term)
+            if not term_postings:
+                return []
+            postings.append(term_postings)
+        # Walk the rarest term's postings and probe the others
+        postings.sort(key=len)
+        if len(postings[0]) > self.max_candidates:
+            self.broad += 1
+            return []
+        doc_count = len(self._docs)
+        avgdl = self._total_length / doc_count
+        idfs = [math.log(1 + (doc_count - len(p) + 0.5) / (len(p) + 0.5)) for p in postings]
+        hits = []
+        for doc_id in postings[0]:
+            if not all(doc_id in p for p in postings[1:]):
+                continue
+            norm = K1 * (1 - B + B * self._docs[self._keys[doc_id]].length / avgdl)
+            score = 0.0
+            for idf, p in zip(idfs, postings):
+                tf = p[doc_id]
+                score += idf * tf * (K1 + 1) / (tf + norm)
+            hits.append((score, doc_id))
+        return hits
+
+    def answer(self, query: str) -> Optional[Dict[str, Any]]:
+        """The stored answer for a confident match, or None."""
+        started = time.perf_counter()
+        self.queries += 1
+        try:
+            terms = set(tokenize(query))
+            now = time.monotonic()
+            # Only documents the query names well enough compete for the answer
+            candidates = []
+            expired = []
+            for score, doc_id in self._rank(terms):
+                key = self._keys[doc_id]
+                doc = self._docs[key]
+                if doc.expires_at is not None and doc.expires_at <= now:
+                    expired.append(key)
+                elif len(doc.key_terms & terms) >= self.min_coverage * len(doc.key_terms):
+                    candidates.append((score, doc_id))
+            for key in expired:
+                self.remove(key)
+                self.expirations += 1
+            if not candidates:
+                return None
+            candidates.sort(reverse=True)
+            if len(candidates) > 1 and candidates[0][0] < candidates[1][0] * self.margin:
+                return None
+            self.hits += 1
+            return self._docs[self._keys[candidates[0][1]]].answer
+        finally:
+            self.query_seconds += time.perf_counter() - started
+
+    async def sync_colleges(self, session_factory=AsyncSessionLocal, chunk_size: int = SEARCH_INDEX_SYNC_CHUNK) -> int:
+        """Pull catalog rows changed since the last sync (e.g. by the ingest CLI).
+
+        After a bulk ingest this can be every row, so they are indexed
+        chunk_size at a time, yielding to the event loop in between, rather
+        than stalling every request for the whole build.
+        """
+        table = College.__table__
+        query = select(table).order_by(table.c.updated_at.desc()).limit(self.max_docs)
+        if self._colleges_synced_at is not None:
+            query = query.where(table.c.updated_at > self._colleges_synced_at)
+        rows = []
+        try:
+            async with session_factory() as db:
+                result = await db.stream(query)
+                async for partition in result.mappings().partitions(chunk_size):
+                    rows.extend(partition)
+        except SQLAlchemyError as e:
+            print(f"❌ Search index sync failed: {e}")
+            return 0
+        if rows:
+            self._colleges_synced_at = rows[0]["updated_at"]
+        # Oldest first, so the newest rows are the last to be evicted
+        rows = rows[::-1]
+        added = 0
+        for start in range(0, len(rows), chunk_size):
+            added += self.add_colleges(rows[start:start + chunk_size])
+            await asyncio.sleep(0)
+        return added
+
+    def stats(self) -> Dict[str, Any]:
+        kinds = Counter(doc.kind for doc in self._docs.values())
+        return {
+            "documents": len(self._docs),
+            "by_kind": dict(kinds),
+            "terms": len(self._postings),
+            "max_docs": self.max_docs,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "queries": self.queries,
+            "hits": self.hits,
+            "hit_ratio": round(self.hits / self.queries, 4) if self.queries else 0.0,
+            "too_broad": self.broad,
+            "avg_query_us": round(self.query_seconds / self.queries * 1e6, 2) if self.queries else 0.0,
+        }
+
+
+# Shared index for /api/search, fed by the catalog, the news loaders and past answers
+search_index = SearchIndex()
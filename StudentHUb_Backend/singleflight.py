@@ -0,0 +1,51 @@
+# backend/singleflight.py
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one in-flight call.
+
+    Every caller awaiting a key that is already running shares that call's
+    result or exception instead of starting its own.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.executions = 0
+        self.merged = 0
+        self.errors = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t, key=key: self._finish(key, t))
+        else:
+            self.merged += 1
+        # Shield so one cancelled caller does not cancel the shared call
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "merged": self.merged,
+            "errors": self.errors,
+            "in_flight": len(self._in_flight),
+        }
+
+
+# Shared group for direct upstream LLM calls
+upstream_flights = SingleFlight("upstream")
@@ -0,0 +1,74 @@
+# backend/streaming.py
+import json
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional
+
+import httpx
+
+from .cache import response_cache
+from .llm_json import IncrementalArrayParser
+from .perplexity import stream_chat_completion
+from .result_store import result_store
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Headers that stop proxies from buffering a streamed response
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one server-sent event with a JSON data line."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def ndjson_line(item: Any) -> str:
+    return json.dumps(item, separators=(",", ":")) + "\n"
+
+
+async def stream_json_array(
+    key: str,
+    instructions: str,
+    prompt: str,
+    ttl: float,
+    snapshot: Optional[List[dict]] = None,
+    max_tokens: int = 3000,
+    deadline: Optional[float] = None,
+    on_result: Optional[Callable[[List[dict]], Awaitable[Any]]] = None,
+) -> AsyncIterator[str]:
+    """Yield a list endpoint's items as NDJSON lines.
+
+    A warm snapshot, cache entry or stored result is replayed immediately;
+    otherwise the completion is streamed from upstream and each object is
+    sent as soon as its closing brace arrives. The finished list is saved to
+    the result store and passed to on_result, the same post-processing the
+    endpoint's load function runs (catalog upsert, news store, alert
+    subscribers), before it is cached; otherwise the cache would look fresh
+    while that work never happened.
+    """
+    items = snapshot if snapshot is not None else response_cache.get(key, allow_stale=True)
+    if items is None:
+        items = await result_store.load(key)
+    if items is not None:
+        for item in items:
+            yield ndjson_line(item)
+        return
+
+    parser = IncrementalArrayParser()
+    items = []
+    try:
+        async with aclosing(stream_chat_completion(instructions, prompt, max_tokens=max_tokens, deadline=deadline)) as deltas:
+            async for delta in deltas:
+                for item in parser.feed(delta):
+                    items.append(item)
+                    yield ndjson_line(item)
+                if parser.done:
+                    break
+    except httpx.HTTPError as e:
+        yield ndjson_line({"error": f"API request failed: {str(e)}"})
+        return
+
+    if items:
+        await result_store.save(key, prompt, items, ttl)
+        if on_result is not None:
+            await on_result(items)
+        response_cache.set(key, items, ttl)
@@ -0,0 +1,222 @@
+# backend/suggest.py
+import asyncio
+import heapq
+import os
+import re
+import time
+import unicodedata
+from bisect import bisect_left
+from typing import Any, Dict, List
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from .database import AsyncSessionLocal
+from .models import College
+
+SUGGEST_MAX_ENTRIES = int(os.getenv("SUGGEST_MAX_ENTRIES", "1000000"))
+SUGGEST_TOP_K = int(os.getenv("SUGGEST_TOP_K", "10"))
+# Prefixes matching more entries than this get their top-k precomputed; smaller ranges are scanned
+SUGGEST_SCAN_LIMIT = int(os.getenv("SUGGEST_SCAN_LIMIT", "256"))
+SUGGEST_REBUILD_INTERVAL = float(os.getenv("SUGGEST_REBUILD_INTERVAL", "60"))
+SUGGEST_MAX_LENGTH = int(os.getenv("SUGGEST_MAX_LENGTH", "80"))
+# Weights per source; a phrase is only suggested once it reaches SUGGEST_MIN_WEIGHT,
+# so a one-off query never shows up in someone else's search box
+SUGGEST_COLLEGE_WEIGHT = float(os.getenv("SUGGEST_COLLEGE_WEIGHT", "1"))
+SUGGEST_QUERY_WEIGHT = float(os.getenv("SUGGEST_QUERY_WEIGHT", "0.5"))
+SUGGEST_RELATED_WEIGHT = float(os.getenv("SUGGEST_RELATED_WEIGHT", "0.25"))
+SUGGEST_MIN_WEIGHT = float(os.getenv("SUGGEST_MIN_WEIGHT", "1"))
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Sorts after every character a normalized phrase can contain
+_PREFIX_END = "\x7f"
+
+
+def normalize_phrase(text: str) -> str:
+    """'I.I.T. Bombay  Placements?' becomes 'iit bombay placements'."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+    return " ".join(_WORD_RE.findall(text.replace(".", "")))
+
+
+class _Snapshot:
+    """Immutable lookup tables; replaced wholesale on every rebuild."""
+
+    __slots__ = ("keys", "phrases", "weights", "top")
+
+    def __init__(self, keys: List[str], phrases: List[str], weights: List[float], top: Dict[str, List[int]]):
+        self.keys = keys
+        self.phrases = phrases
+        self.weights = weights
+        # prefix -> positions of its best entries, for every prefix too broad to scan
+        self.top = top
+
+
+class SuggestIndex:
+    """Prefix suggestions ranked by weight over a sorted array.
+
+    Lookups bisect the sorted phrases for the prefix range. Ranges longer
+    than scan_limit have their top-k precomputed at build time, so every
+    lookup touches at most scan_limit entries. record() and seed() only
+    queue updates; rebuild() merges them on a worker thread and swaps in the
+    new snapshot with one assignment, so readers never wait on a build.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = SUGGEST_MAX_ENTRIES,
+        top_k: int = SUGGEST_TOP_K,
+        scan_limit: int = SUGGEST_SCAN_LIMIT,
+        min_weight: float = SUGGEST_MIN_WEIGHT,
+    ):
+        self.max_entries = max_entries
+        self.top_k = top_k
+        self.scan_limit = scan_limit
+        self.min_weight = min_weight
+        self._snapshot = _Snapshot([], [], [], {})
+        # key -> [display text, weight to add, weight floor]; swapped out by rebuild()
+        self._pending: Dict[str, list] = {}
+        # Owned by the builder; only touched under _rebuild_lock
+        self._weights: Dict[str, float] = {}
+        self._display: Dict[str, str] = {}
+        self._rebuild_lock = asyncio.Lock()
+        self._colleges_synced_at = None
+        self.rebuilds = 0
+        self.last_build_seconds = 0.0
+        self.lookups = 0
+        self.lookup_seconds = 0.0
+
+    def _queue(self, text: str, add: float, floor: float) -> None:
+        text = " ".join(text.split())
+        if not text or len(text) > SUGGEST_MAX_LENGTH:
+            return
+        key = normalize_phrase(text)
+        if not key:
+            return
+        entry = self._pending.get(key)
+        if entry is None:
+            self._pending[key] = [text, add, floor]
+        else:
+            entry[1] += add
+            entry[2] = max(entry[2], floor)
+
+    def record(self, text: str, weight: float = SUGGEST_QUERY_WEIGHT) -> None:
+        """Count one more use of a phrase (a submitted query or a related query)."""
+        self._queue(text, weight, 0.0)
+
+    def seed(self, text: str, weight: float = SUGGEST_COLLEGE_WEIGHT) -> None:
+        """Make sure a phrase weighs at least weight, however often it is seeded."""
+        self._queue(text, 0.0, weight)
+
+    def suggest(self, prefix: str, limit: int = SUGGEST_TOP_K) -> List[str]:
+        started = time.perf_counter()
+        snapshot = self._snapshot
+        key = normalize_phrase(prefix)
+        if key and prefix[-1:].isspace():
+            # "iit " should complete "iit bombay", not "iitm"
+            key += " "
+        limit = max(1, min(limit, self.top_k))
+        positions = snapshot.top.get(key) if key else []
+        if positions is None:
+            lo = bisect_left(snapshot.keys, key)
+            hi = bisect_left(snapshot.keys, key + _PREFIX_END, lo)
+            positions = heapq.nlargest(limit, range(lo, hi), key=snapshot.weights.__getitem__)
+        result = [snapshot.phrases[i] for i in positions[:limit]]
+        self.lookups += 1
+        self.lookup_seconds += time.perf_counter() - started
+        return result
+
+    async def sync_colleges(self, session_factory=AsyncSessionLocal) -> int:
+        """Seed college names changed since the last sync."""
+        query = select(College.name, College.updated_at).order_by(College.updated_at.desc()).limit(self.max_entries)
+        if self._colleges_synced_at is not None:
+            query = query.where(College.updated_at > self._colleges_synced_at)
+        try:
+            async with session_factory() as db:
+                rows = (await db.execute(query)).all()
+        except SQLAlchemyError as e:
+            print(f"❌ Suggestion sync failed: {e}")
+            return 0
+        if rows:
+            self._colleges_synced_at = rows[0].updated_at
+        for row in rows:
+            self.seed(row.name)
+        return len(rows)
+
+    async def rebuild(self) -> bool:
+        """Merge queued updates into a new snapshot and swap it in (False if nothing changed)."""
+        async with self._rebuild_lock:
+            if not self._pending and self.rebuilds:
+                return False
+            pending, self._pending = self._pending, {}
+            started = time.perf_counter()
+            snapshot = await asyncio.to_thread(self._build, pending)
+            self._snapshot = snapshot
+            self.last_build_seconds = round(time.perf_counter() - started, 3)
+            self.rebuilds += 1
+            return True
+
+    async def refresh(self) -> Dict[str, Any]:
+        """Scheduler job: pick up new colleges, then rebuild if anything changed."""
+        await self.sync_colleges()
+        await self.rebuild()
+        return self.stats()
+
+    def _build(self, pending: Dict[str, list]) -> _Snapshot:
+        weights = self._weights
+        for key, (text, add, floor) in pending.items():
+            weights[key] = max(weights.get(key, 0.0) + add, floor)
+            # Keep the first spelling seen unless a seed (a college name) provides one
+            if key not in self._display or floor:
+                self._display[key] = text
+        if len(weights) > self.max_entries:
+            keep = heapq.nlargest(self.max_entries, weights.items(), key=lambda item: item[1])
+            self._weights = weights = dict(keep)
+            self._display = {key: self._display[key] for key in weights}
+
+        keys = sorted(key for key, weight in weights.items() if weight >= self.min_weight)
+        ranked = [weights[key] for key in keys]
+        top: Dict[str, List[int]] = {}
+        if keys:
+            self._fill_top(keys, ranked, 0, len(keys), 0, top)
+        return _Snapshot(keys, [self._display[key] for key in keys], ranked, top)
+
+    def _fill_top(self, keys: List[str], weights: List[float], lo: int, hi: int, depth: int, top: Dict[str, List[int]]) -> List[int]:
+        """Top-k positions in keys[lo:hi], which all share their first depth characters.
+
+        Records the result in top when the range is too long to scan at lookup
+        time. Each child range is built from its own children, so every entry
+        is scanned once in total.
+        """
+        if hi - lo <= self.scan_limit:
+            return heapq.nlargest(self.top_k, range(lo, hi), key=weights.__getitem__)
+        prefix = keys[lo][:depth]
+        candidates = []
+        i = lo
+        if len(keys[i]) == depth:
+            # The prefix is itself a phrase; it sorts first in its range
+            candidates.append(i)
+            i += 1
+        while i < hi:
+            child_end = bisect_left(keys, keys[i][:depth + 1] + _PREFIX_END, i, hi)
+            candidates.extend(self._fill_top(keys, weights, i, child_end, depth + 1, top))
+            i = child_end
+        best = heapq.nlargest(self.top_k, candidates, key=weights.__getitem__)
+        top[prefix] = best
+        return best
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "entries": len(self._weights),
+            "suggestible": len(snapshot.keys),
+            "precomputed_prefixes": len(snapshot.top),
+            "pending": len(self._pending),
+            "rebuilds": self.rebuilds,
+            "last_build_seconds": self.last_build_seconds,
+            "lookups": self.lookups,
+            "avg_lookup_us": round(self.lookup_seconds / self.lookups * 1e6, 2) if self.lookups else 0.0,
+        }
+
+
+# Shared suggestions for /api/search/suggest, rebuilt by the prefetch scheduler
+suggest_index = SuggestIndex()
@@ -0,0 +1,64 @@
+# backend/tests/conftest.py
+"""Shared fixtures: a throwaway SQLite database and the fake Perplexity upstream.
+
+Run from the repository root:
+    python -m pytest StudentHUb_Backend/tests
+"""
+import os
+import sys
+import tempfile
+
+# Configure before any backend module reads its settings at import time
+_DB_DIR = tempfile.mkdtemp(prefix="studenthub-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["PERPLEXITY_API_KEY"] = "test"
+os.environ["PREFETCH_ENABLED"] = "0"
+os.environ["UPSTREAM_BACKOFF_BASE"] = "0.001"
+os.environ["ADMIN_TOKEN"] = "test-admin"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import httpx
+import pytest
+
+from StudentHUb_Backend import perplexity
+from StudentHUb_Backend.benchmarks import fake_upstream
+from StudentHUb_Backend.cache import response_cache
+from StudentHUb_Backend.database import Base, engine
+from StudentHUb_Backend.main import app
+from StudentHUb_Backend.resilience import CircuitBreaker, RetryBudget
+
+FAKE_UPSTREAM_URL = "http://fake-upstream/chat/completions"
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """Fresh tables and an empty response cache for every test."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    response_cache._entries.clear()
+    response_cache._bytes = 0
+    yield engine
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Route Perplexity calls to benchmarks/fake_upstream.py, with no faults and a fresh breaker."""
+    fake_upstream.faults.update(latency=0.0, jitter=0.0, error_rate=0.0, error_status=503, retry_after=None)
+    fake_upstream.counters.update(requests=0, errors=0)
+    monkeypatch.setattr(perplexity, "PERPLEXITY_API_URL", FAKE_UPSTREAM_URL)
+    monkeypatch.setattr(perplexity, "_client", httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_upstream.app)))
+    monkeypatch.setattr(perplexity, "upstream_breaker", CircuitBreaker(min_requests=5, open_seconds=60))
+    monkeypatch.setattr(perplexity, "upstream_retry_budget", RetryBudget())
+    yield fake_upstream
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
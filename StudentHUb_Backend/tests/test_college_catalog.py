@@ -0,0 +1,106 @@
+import pytest
+
+from StudentHUb_Backend.college_catalog import SORTS, InvalidCursor, encode_cursor, list_colleges, upsert_colleges
+from StudentHUb_Backend.database import AsyncSessionLocal, SessionLocal
+from StudentHUb_Backend.ingest import ingest
+from StudentHUb_Backend.models import College
+
+pytestmark = pytest.mark.anyio
+
+
+async def seed_catalog(count: int = 23) -> None:
+    # Every third college is unranked, and ranks repeat so ties need the id tiebreak
+    colleges = [
+        {"name": f"College {i:02d}", "nirf_ranking": None if i % 3 == 0 else i % 7 + 1, "naac_grade": "A"}
+        for i in range(count)
+    ]
+    assert await upsert_colleges(colleges) == count
+
+
+async def all_pages(sort: str, limit: int, **filters):
+    pages, cursor = [], None
+    async with AsyncSessionLocal() as db:
+        while True:
+            page, cursor = await list_colleges(db, sort=sort, limit=limit, cursor=cursor, **filters)
+            pages.append(page)
+            if cursor is None:
+                return pages
+
+
+def expected_order(sort: str):
+    column, descending = SORTS[sort]
+    with SessionLocal() as db:
+        colleges = db.query(College).order_by(College.id).all()
+    # Stable sorts: ties keep ascending ids in either direction, unranked rows go last
+    ranked = sorted((c for c in colleges if getattr(c, column.key) is not None), key=lambda c: getattr(c, column.key), reverse=descending)
+    unranked = [c for c in colleges if getattr(c, column.key) is None]
+    return [c.name for c in ranked + unranked]
+
+
+@pytest.mark.parametrize("sort", list(SORTS))
+@pytest.mark.parametrize("limit", [1, 4, 7, 100])
+async def test_keyset_pages_cover_every_row_once_in_order(sort, limit):
+    await seed_catalog()
+    pages = await all_pages(sort, limit)
+    names = [college["name"] for page in pages for college in page]
+    assert names == expected_order(sort)
+    assert all(len(page) <= limit for page in pages)
+
+
+async def test_pages_respect_filters():
+    await seed_catalog()
+    pages = await all_pages("rank", 2, min_rank=3, max_rank=4)
+    ranks = [college["nirf_ranking"] for page in pages for college in page]
+    assert ranks and all(3 <= rank <= 4 for rank in ranks)
+    assert ranks == sorted(ranks)
+
+
+async def test_malformed_cursor_is_rejected():
+    async with AsyncSessionLocal() as db:
+        with pytest.raises(InvalidCursor):
+            await list_colleges(db, cursor="not-a-cursor")
+
+
+async def test_cursor_from_another_sort_is_rejected():
+    async with AsyncSessionLocal() as db:
+        with pytest.raises(InvalidCursor):
+            await list_colleges(db, sort="rank", cursor=encode_cursor("name", "College 01", 1))
+
+
+def catalog():
+    with SessionLocal() as db:
+        return {c.name: c for c in db.query(College).all()}
+
+
+async def test_blank_fields_never_erase_stored_values():
+    await upsert_colleges([{"name": "IIT Bombay", "fee_structure": "2.2 L", "avg_package": "23 LPA"}])
+    await upsert_colleges([{"name": "IIT Bombay", "nirf_ranking": 3}])
+    college = catalog()["IIT Bombay"]
+    assert (college.fee_structure, college.avg_package, college.nirf_ranking) == ("2.2 L", "23 LPA", 3)
+
+
+async def test_ingested_values_win_over_llm_refreshes():
+    await upsert_colleges([{"name": "IIT Bombay", "nirf_ranking": 40, "fee_structure": "2.2 L"}])
+    ingest([{"Institute Name": "IIT Bombay", "City": "Mumbai", "NIRF Rank": "3"}], progress_every=None)
+    college = catalog()["IIT Bombay"]
+    # The official rank replaces the LLM's, the LLM-only field survives
+    assert (college.nirf_ranking, college.fee_structure, college.source) == (3, "2.2 L", "ingest")
+
+    await upsert_colleges([{"name": "IIT Bombay", "nirf_ranking": 99, "location": "Pune", "naac_grade": "A++"}])
+    college = catalog()["IIT Bombay"]
+    # An LLM refresh only fills the gaps of an ingested row
+    assert (college.nirf_ranking, college.location, college.naac_grade) == (3, "Mumbai", "A++")
+    assert college.source == "ingest"
+
+
+async def test_llm_rows_take_new_llm_values():
+    await upsert_colleges([{"name": "VIT Vellore", "nirf_ranking": 11}])
+    await upsert_colleges([{"name": "VIT Vellore", "nirf_ranking": 9}])
+    college = catalog()["VIT Vellore"]
+    assert (college.nirf_ranking, college.source) == (9, "llm")
+
+
+async def test_only_the_private_list_marks_colleges_private():
+    await upsert_colleges([{"name": "BITS Pilani"}], is_private=True)
+    await upsert_colleges([{"name": "BITS Pilani"}])
+    assert catalog()["BITS Pilani"].is_private
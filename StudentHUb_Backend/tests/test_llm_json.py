@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from StudentHUb_Backend.llm_json import IncrementalArrayParser, extract_json_from_response
+
+ITEMS = [
+    {"name": "IIT Bombay", "note": "brackets ] [ and braces } { in a string"},
+    {"name": "Say \"hi\"", "tags": ["a", "b"], "nested": {"x": [1, {"y": 2}]}},
+    {"name": "IIT Delhi"},
+]
+RESPONSE = "Here are the colleges [1][2]:\n```json\n" + json.dumps(ITEMS, indent=2) + "\n```\nSources: [3]"
+
+
+def feed_in_chunks(text: str, size: int):
+    parser = IncrementalArrayParser()
+    items = []
+    for start in range(0, len(text), size):
+        items.extend(parser.feed(text[start:start + size]))
+    return parser, items
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 64, len(RESPONSE)])
+def test_parser_yields_every_object_whatever_the_chunking(size):
+    parser, items = feed_in_chunks(RESPONSE, size)
+    assert items == ITEMS
+    assert parser.done
+
+
+def test_parser_skips_citation_markers_before_the_array():
+    _, items = feed_in_chunks('See [1] and [ 2 ].\n[{"a": 1}]', 3)
+    assert items == [{"a": 1}]
+
+
+def test_parser_yields_complete_objects_of_truncated_output():
+    text = json.dumps(ITEMS)
+    parser, items = feed_in_chunks(text[: text.index('{"name": "IIT Delhi"') + 10], 5)
+    assert items == ITEMS[:2]
+    assert not parser.done
+
+
+def test_parser_ignores_input_after_the_array():
+    parser = IncrementalArrayParser()
+    assert parser.feed('[{"a": 1}]') == [{"a": 1}]
+    assert parser.feed('[{"b": 2}]') == []
+
+
+def test_extract_handles_fences_prose_and_citations():
+    assert extract_json_from_response(RESPONSE) == ITEMS
+
+
+def test_extract_repairs_trailing_commas():
+    assert extract_json_from_response('[{"a": 1,}, {"b": 2},]') == [{"a": 1}, {"b": 2}]
+
+
+def test_extract_closes_truncated_array():
+    assert extract_json_from_response('[{"a": 1}, {"b": 2}, {"c":') == [{"a": 1}, {"b": 2}]
+
+
+def test_extract_prefers_object_array_over_stray_empty_array():
+    assert extract_json_from_response('Notes: [] and then [{"a":1}]') == [{"a": 1}]
+
+
+def test_extract_falls_back_to_empty_array():
+    assert extract_json_from_response("Nothing new today: []") == []
+
+
+def test_extract_rejects_responses_without_an_array():
+    with pytest.raises(ValueError):
+        extract_json_from_response("No data [1] available.")
@@ -0,0 +1,152 @@
+import asyncio
+
+import httpx
+import pytest
+
+from StudentHUb_Backend import perplexity
+from StudentHUb_Backend.resilience import CircuitBreaker, CircuitOpenError, RetryBudget, resilient_send
+
+pytestmark = pytest.mark.anyio
+
+REQUEST = httpx.Request("POST", "http://upstream/chat/completions")
+
+
+def response(status: int) -> httpx.Response:
+    return httpx.Response(status, request=REQUEST)
+
+
+def sender(*statuses: int):
+    """A send() that returns the given statuses in turn and counts its calls."""
+    calls = []
+
+    async def send() -> httpx.Response:
+        calls.append(1)
+        return response(statuses[min(len(calls), len(statuses)) - 1])
+
+    return send, calls
+
+
+def open_breaker(**kwargs) -> CircuitBreaker:
+    breaker = CircuitBreaker(min_requests=2, **kwargs)
+    breaker.record(False)
+    breaker.record(False)
+    assert breaker.state == "open"
+    return breaker
+
+
+def test_breaker_opens_at_failure_rate():
+    breaker = CircuitBreaker(failure_rate=0.5, min_requests=4, open_seconds=60)
+    for ok in (True, True, False):
+        breaker.record(ok)
+    assert breaker.state == "closed"
+    breaker.record(False)
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_breaker_lets_one_probe_through_when_half_open():
+    breaker = open_breaker(open_seconds=0)
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()
+
+    breaker.record(True)
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens_breaker():
+    breaker = open_breaker(open_seconds=0)
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.state == "open"
+    assert breaker.times_opened == 2
+
+
+def test_stale_probe_is_replaced():
+    breaker = open_breaker(open_seconds=0, probe_timeout=0)
+    assert breaker.allow()
+    # The first probe never reported back; the next caller takes over
+    assert breaker.allow()
+
+
+async def test_cancelled_probe_does_not_leave_breaker_half_open():
+    breaker = open_breaker(open_seconds=0)
+    started = asyncio.Event()
+
+    async def hang() -> httpx.Response:
+        started.set()
+        await asyncio.sleep(60)
+
+    task = asyncio.create_task(resilient_send(hang, deadline=30, breaker=breaker, budget=RetryBudget()))
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert breaker.state == "open"
+
+
+async def test_probe_failing_before_upstream_does_not_leave_breaker_half_open():
+    breaker = open_breaker(open_seconds=0)
+
+    async def queue_timeout() -> httpx.Response:
+        raise RuntimeError("outbound queue full")
+
+    with pytest.raises(RuntimeError):
+        await resilient_send(queue_timeout, deadline=30, breaker=breaker, budget=RetryBudget())
+    assert breaker.state == "open"
+
+
+async def test_retries_retryable_status_then_succeeds():
+    send, calls = sender(503, 502, 200)
+    result = await resilient_send(send, deadline=30, breaker=CircuitBreaker(), budget=RetryBudget(), max_attempts=3)
+    assert result.status_code == 200
+    assert len(calls) == 3
+
+
+async def test_client_errors_are_not_retried():
+    send, calls = sender(400)
+    result = await resilient_send(send, deadline=30, breaker=CircuitBreaker(), budget=RetryBudget())
+    assert result.status_code == 400
+    assert len(calls) == 1
+
+
+async def test_retry_budget_caps_retries():
+    budget = RetryBudget(ratio=0, minimum=1)
+    send, calls = sender(503)
+    with pytest.raises(httpx.HTTPStatusError):
+        await resilient_send(send, deadline=30, breaker=CircuitBreaker(), budget=budget, max_attempts=5)
+    # One first attempt plus the single retry the budget allows
+    assert len(calls) == 2
+    assert budget.stats()["exhausted"] == 1
+
+
+async def test_deadline_covers_retries():
+    async def slow() -> httpx.Response:
+        await asyncio.sleep(1)
+        return response(200)
+
+    breaker = CircuitBreaker()
+    with pytest.raises(httpx.TimeoutException):
+        await resilient_send(slow, deadline=0.05, breaker=breaker, budget=RetryBudget())
+    assert breaker.stats()["window_failure_rate"] == 1.0
+
+
+async def test_chat_completion_against_fake_upstream(upstream):
+    content = await perplexity.chat_completion("instructions", "List colleges")
+    assert "Item 1" in content
+    assert upstream.counters["requests"] == 1
+
+
+async def test_open_circuit_fails_fast_against_fake_upstream(upstream):
+    upstream.faults["error_rate"] = 1.0
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPError):
+            await perplexity.chat_completion("instructions", "List colleges")
+    assert perplexity.upstream_breaker.state == "open"
+
+    requests = upstream.counters["requests"]
+    with pytest.raises(CircuitOpenError):
+        await perplexity.chat_completion("instructions", "List colleges")
+    assert upstream.counters["requests"] == requests
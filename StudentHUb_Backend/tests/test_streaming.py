@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from StudentHUb_Backend.broadcast import alert_hub
+
+pytestmark = pytest.mark.anyio
+
+
+def ndjson(text: str):
+    return [json.loads(line) for line in text.splitlines() if line]
+
+
+async def test_streamed_list_fills_catalog_before_it_is_cached(client, upstream):
+    response = await client.get("/api/colleges/", params={"stream": "ndjson"})
+    assert response.status_code == 200
+    streamed = [item["name"] for item in ndjson(response.text)]
+    assert streamed == [f"Item {i}" for i in range(1, 11)]
+
+    # The stream cached the list, so this must be answered from the catalog it filled
+    response = await client.get("/api/colleges/", params={"limit": 100})
+    assert response.status_code == 200
+    assert sorted(college["name"] for college in response.json()) == sorted(streamed)
+    assert upstream.counters["requests"] == 1
+
+
+async def test_streamed_private_list_fills_catalog(client, upstream):
+    await client.get("/api/private_colleges/", params={"stream": "ndjson"})
+    response = await client.get("/api/private_colleges/", params={"limit": 100})
+    assert response.status_code == 200
+    assert len(response.json()) == 10
+    assert upstream.counters["requests"] == 1
+
+
+async def test_streamed_alerts_reach_subscribers(client, upstream):
+    await client.get("/api/alerts/", params={"category": "exam_alerts", "stream": "ndjson"})
+    assert alert_hub.has_state("exam_alerts")
+    assert alert_hub._items["exam_alerts"][0]["title"] == "Item 1"
+
+
+async def test_streamed_news_is_stored(client, upstream):
+    await client.get("/api/education/", params={"stream": "ndjson"})
+    response = await client.get("/api/education/")
+    assert response.status_code == 200
+    assert [item["title"] for item in response.json()][0] == "Item 1"
+    assert response.headers["X-Next-Cursor"]
+    assert upstream.counters["requests"] == 1
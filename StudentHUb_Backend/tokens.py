@@ -0,0 +1,127 @@
+# backend/tokens.py
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import Header, HTTPException
+
+# Signing keys as "kid:secret" pairs separated by commas. The first key signs
+# new tokens; every listed key is accepted, so rotate by prepending a new key
+# and dropping the old one after SESSION_TTL has passed.
+SESSION_KEYS = os.getenv("SESSION_KEYS", "")
+SESSION_TTL = int(os.getenv("SESSION_TTL", str(7 * 24 * 60 * 60)))
+REVOKED_MAX_ENTRIES = int(os.getenv("REVOKED_MAX_ENTRIES", "100000"))
+TOKEN_VERSION = "v1"
+
+
+class InvalidToken(ValueError):
+    pass
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def parse_keys(value: str) -> List[Tuple[str, bytes]]:
+    keys = []
+    for item in value.split(","):
+        kid, sep, secret = item.strip().partition(":")
+        if not sep or not kid or not secret:
+            continue
+        keys.append((kid, secret.encode("utf-8")))
+    return keys
+
+
+class TokenSigner:
+    """Issues and checks HMAC-SHA256 signed tokens: v1.<kid>.<claims>.<signature>.
+
+    Verification is CPU only: a signature check, an expiry check and a lookup
+    in the in-memory revocation set.
+    """
+
+    def __init__(self, keys: List[Tuple[str, bytes]], ttl: int = SESSION_TTL):
+        if not keys:
+            raise ValueError("At least one signing key is required.")
+        self.ttl = ttl
+        self.signing_kid = keys[0][0]
+        self.keys: Dict[str, bytes] = dict(keys)
+        # jti -> exp; entries are useless once the token would have expired anyway
+        self._revoked: Dict[str, int] = {}
+
+    def _sign(self, kid: str, body: str) -> str:
+        message = f"{TOKEN_VERSION}.{kid}.{body}".encode("ascii")
+        return _b64encode(hmac.new(self.keys[kid], message, hashlib.sha256).digest())
+
+    def issue(self, subject: str, ttl: Optional[int] = None, **claims: Any) -> Tuple[str, int]:
+        now = int(time.time())
+        expires_at = now + (ttl or self.ttl)
+        payload = {"sub": subject, "iat": now, "exp": expires_at, "jti": secrets.token_hex(8), **claims}
+        body = _b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        token = f"{TOKEN_VERSION}.{self.signing_kid}.{body}.{self._sign(self.signing_kid, body)}"
+        return token, expires_at
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        try:
+            version, kid, body, signature = token.split(".")
+        except ValueError:
+            raise InvalidToken("Malformed token.")
+        if not token.isascii():
+            raise InvalidToken("Malformed token.")
+        if version != TOKEN_VERSION or kid not in self.keys:
+            raise InvalidToken("Unknown token version or key.")
+        if not hmac.compare_digest(signature, self._sign(kid, body)):
+            raise InvalidToken("Bad signature.")
+        try:
+            claims = json.loads(_b64decode(body))
+        except ValueError:
+            raise InvalidToken("Malformed token.")
+        if claims.get("exp", 0) <= time.time():
+            raise InvalidToken("Token expired.")
+        if claims.get("jti") in self._revoked:
+            raise InvalidToken("Token revoked.")
+        return claims
+
+    def revoke(self, claims: Dict[str, Any]) -> None:
+        if len(self._revoked) >= REVOKED_MAX_ENTRIES:
+            self._prune()
+        self._revoked[claims["jti"]] = claims["exp"]
+
+    def _prune(self) -> None:
+        now = time.time()
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+        if len(self._revoked) >= REVOKED_MAX_ENTRIES:
+            # Still full: keep the half that stays valid longest
+            keep = sorted(self._revoked.items(), key=lambda item: item[1])[len(self._revoked) // 2:]
+            self._revoked = dict(keep)
+
+
+def _load_keys() -> List[Tuple[str, bytes]]:
+    keys = parse_keys(SESSION_KEYS)
+    if not keys:
+        print("❌ SESSION_KEYS is not set; using a random key, so sessions end on restart and are not shared between workers.")
+        keys = [("dev", secrets.token_bytes(32))]
+    return keys
+
+
+# Shared signer for /api/auth and require_session
+token_signer = TokenSigner(_load_keys())
+
+
+# Dependency: validate "Authorization: Bearer <token>" and return its claims
+async def require_session(authorization: str | None = Header(default=None)) -> Dict[str, Any]:
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    try:
+        return token_signer.verify(token.strip())
+    except InvalidToken as e:
+        raise HTTPException(status_code=401, detail=str(e), headers={"WWW-Authenticate": "Bearer"})
@@ -0,0 +1,143 @@
+# backend/trending.py
+import heapq
+import math
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .search_cache import canonicalize
+
+# Queries tracked per window; memory stays at this many entries whatever the traffic
+TRENDING_CAPACITY = int(os.getenv("TRENDING_CAPACITY", "1000"))
+# Guaranteed (decayed) count a query needs before it is shown as trending; the
+# default lets a query searched twice recently through, but never a one-off
+TRENDING_MIN_COUNT = float(os.getenv("TRENDING_MIN_COUNT", "1.5"))
+TRENDING_MAX_LENGTH = int(os.getenv("TRENDING_MAX_LENGTH", "100"))
+
+# Window name -> decay time constant (seconds)
+WINDOWS = {
+    "hour": 60 * 60,
+    "day": 24 * 60 * 60,
+    "week": 7 * 24 * 60 * 60,
+}
+
+# Rescale once weights reach e**RESCALE_EXPONENT so floats never overflow
+RESCALE_EXPONENT = 50.0
+
+
+class DecayedSpaceSaving:
+    """Space-Saving heavy hitters with exponentially decayed counts.
+
+    Keeps at most capacity counters. A new query past capacity takes over
+    the smallest counter and inherits its count as the error bound, so
+    every true heavy hitter stays tracked. Forward decay weighs an event at
+    time t by e**((t - landmark) / tau) instead of shrinking every counter
+    as time passes; all counts scale alike, so the order never changes and
+    the smallest counter can be found with a lazily rebuilt min-heap.
+    """
+
+    def __init__(self, tau: float, capacity: int = TRENDING_CAPACITY, clock=time.time):
+        self.tau = tau
+        self.capacity = capacity
+        self._clock = clock
+        self._landmark = clock()
+        # key -> [count, error, display text] in landmark units
+        self._counters: Dict[str, list] = {}
+        # (count when pushed, key); stale entries are skipped on pop
+        self._heap: List[Tuple[float, str]] = []
+        self.events = 0
+        self.replacements = 0
+        self.rescales = 0
+
+    def _weight(self, now: float) -> float:
+        exponent = (now - self._landmark) / self.tau
+        if exponent > RESCALE_EXPONENT:
+            self._rescale(now)
+            exponent = 0.0
+        return math.exp(exponent)
+
+    def _rescale(self, now: float) -> None:
+        factor = math.exp(-(now - self._landmark) / self.tau)
+        for counter in self._counters.values():
+            counter[0] *= factor
+            counter[1] *= factor
+        self._landmark = now
+        self._rebuild_heap()
+        self.rescales += 1
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(counter[0], key) for key, counter in self._counters.items()]
+        heapq.heapify(self._heap)
+
+    def _pop_min(self) -> str:
+        while True:
+            count, key = heapq.heappop(self._heap)
+            counter = self._counters.get(key)
+            if counter is not None and counter[0] == count:
+                return key
+
+    def add(self, key: str, display: str, now: Optional[float] = None) -> None:
+        weight = self._weight(self._clock() if now is None else now)
+        self.events += 1
+        counter = self._counters.get(key)
+        if counter is None:
+            if len(self._counters) < self.capacity:
+                counter = self._counters[key] = [0.0, 0.0, display]
+            else:
+                evicted = self._counters.pop(self._pop_min())
+                counter = self._counters[key] = [evicted[0], evicted[0], display]
+                self.replacements += 1
+        counter[0] += weight
+        counter[2] = display
+        heapq.heappush(self._heap, (counter[0], key))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def top(self, limit: int, min_count: float = 0.0, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Heaviest queries with their decayed count and the guaranteed part of it."""
+        scale = math.exp(-((self._clock() if now is None else now) - self._landmark) / self.tau)
+        result = []
+        for count, error, display in sorted(self._counters.values(), key=lambda counter: counter[0], reverse=True):
+            if (count - error) * scale < min_count:
+                continue
+            result.append({"query": display, "count": round(count * scale, 2), "guaranteed": round((count - error) * scale, 2)})
+            if len(result) >= limit:
+                break
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tau_seconds": self.tau,
+            "tracked": len(self._counters),
+            "capacity": self.capacity,
+            "events": self.events,
+            "replacements": self.replacements,
+            "rescales": self.rescales,
+        }
+
+
+class TrendingQueries:
+    """One decayed Space-Saving summary per window, fed every search query."""
+
+    def __init__(self, windows: Dict[str, float] = WINDOWS, capacity: int = TRENDING_CAPACITY):
+        self.windows = {name: DecayedSpaceSaving(tau, capacity) for name, tau in windows.items()}
+
+    def record(self, query: str) -> None:
+        display = " ".join(query.split())
+        if not display or len(display) > TRENDING_MAX_LENGTH:
+            return
+        # Variants of one question ("IIT bombay placements?") count together
+        key = canonicalize(display)
+        now = time.time()
+        for summary in self.windows.values():
+            summary.add(key, display, now)
+
+    def top(self, window: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return self.windows[window].top(limit, TRENDING_MIN_COUNT)
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: summary.stats() for name, summary in self.windows.items()}
+
+
+# Shared trending tracker for /api/search
+trending_queries = TrendingQueries()
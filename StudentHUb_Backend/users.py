@@ -0,0 +1,102 @@
+# backend/users.py
+"""User persistence helpers and a bulk import CLI.
+
+Import a CSV with "phone" and "location" columns, from the repository root:
+    python -m StudentHUb_Backend.users users.csv [--batch-size 1000] [--verified]
+"""
+import argparse
+import csv
+import sys
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import UPSERT_BATCH_SIZE, Base, SessionLocal, engine, upsert_statement
+from .models import User
+
+
+async def upsert_verified_user(db: AsyncSession, phone: str, location: Optional[str]) -> Dict[str, Any]:
+    """Create or update the user for phone in one INSERT ... ON CONFLICT (phone) DO UPDATE.
+
+    Uses RETURNING where the dialect supports it (Postgres, SQLite 3.35+);
+    older SQLite falls back to a follow-up SELECT. The caller commits.
+    """
+    dialect = db.bind.dialect
+    stmt = upsert_statement(
+        User.__table__,
+        [{"phone": phone, "location": location, "is_verified": True}],
+        index_elements=["phone"],
+        update_columns=["location", "is_verified"],
+        dialect_name=dialect.name,
+    )
+    if dialect.insert_returning:
+        result = await db.execute(stmt.returning(User.id, User.phone, User.location))
+        return dict(result.one()._mapping)
+
+    await db.execute(stmt)
+    result = await db.execute(select(User.id, User.phone, User.location).where(User.phone == phone))
+    return dict(result.one()._mapping)
+
+
+def _batches(rows: Iterable[Dict[str, Any]], batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        # One row per phone per statement; Postgres rejects a batch that updates a row twice
+        batch[row["phone"]] = row
+        if len(batch) >= batch_size:
+            yield list(batch.values())
+            batch = {}
+    if batch:
+        yield list(batch.values())
+
+
+def import_users(
+    rows: Iterable[Dict[str, Any]],
+    batch_size: int = UPSERT_BATCH_SIZE,
+    verified: bool = False,
+    session_factory=SessionLocal,
+) -> int:
+    """Upsert users from dicts with "phone" and optional "location" keys.
+
+    Rows are written in batches of one executemany and one commit each, so
+    memory stays flat however long the input is. Existing users keep their
+    verified flag unless verified is set, and a blank location keeps the
+    stored one. Returns the rows written.
+    """
+    written = 0
+    cleaned = (
+        {"phone": row["phone"].strip(), "location": (row.get("location") or "").strip() or None, "is_verified": verified}
+        for row in rows
+        if (row.get("phone") or "").strip()
+    )
+    with session_factory() as db:
+        # Never un-verify someone who already completed OTP
+        update_columns = ["location", "is_verified"] if verified else ["location"]
+        stmt = upsert_statement(User.__table__, None, ["phone"], update_columns, db.bind.dialect.name, keep_existing=["location"])
+        for batch in _batches(cleaned, batch_size):
+            db.execute(stmt, batch)
+            db.commit()
+            written += len(batch)
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk import users from a CSV file.")
+    parser.add_argument("path", help="CSV file with phone and location columns ('-' for stdin)")
+    parser.add_argument("--batch-size", type=int, default=UPSERT_BATCH_SIZE)
+    parser.add_argument("--verified", action="store_true", help="mark imported users as verified")
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    source = sys.stdin if args.path == "-" else open(args.path, newline="", encoding="utf-8")
+    with source:
+        written = import_users(csv.DictReader(source), batch_size=args.batch_size, verified=args.verified)
+    elapsed = time.perf_counter() - started
+    print(f"🔹 Imported {written} users in {elapsed:.1f}s ({written / elapsed if elapsed else 0:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()